@@ -5,30 +5,75 @@ Advanced authentication and authorization for maximum security
 """
 
 import os
-import jwt
+import mmap
 import time
+import atexit
+import asyncio
+import threading
 import hmac
+import heapq
 import hashlib
+import base64
 import secrets
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
 from fastapi import HTTPException, Request
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
 
+# Prefer the Rust-backed PyJWT-compatible implementation when installed
+try:
+    import jwt_rs as jwt
+    JWT_BACKEND = "jwt_rs"
+except ImportError:
+    import jwt
+    JWT_BACKEND = "pyjwt"
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWT"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _to_timestamp(value) -> float:
+    """Unix timestamp from a stored float or a legacy naive-UTC ISO string"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+    return value
+
+
+def _isoformat(timestamp: float) -> str:
+    """Naive-UTC ISO string for API responses"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# API keys are "pllm_" followed by 32 random bytes in unpadded base64url
+API_KEY_PREFIX = "pllm_"
+API_KEY_LENGTH = len(API_KEY_PREFIX) + len(_b64url(bytes(32)))
+
+
+# Marker for AES-GCM sealed files; legacy Fernet tokens start with "gAAAA"
+ENCRYPTED_FILE_MAGIC = b"PLLM\x01"
+
 
 @dataclass
 class User:
     username: str
     password_hash: str
-    api_keys: List[str]
-    permissions: List[str]
-    created_at: datetime
-    last_login: Optional[datetime]
+    api_key_hashes: List[str]
+    permissions: FrozenSet[str]
+    created_at: float
+    last_login: Optional[float]
     is_active: bool
     rate_limit: int
 
@@ -37,8 +82,8 @@ class User:
 class Session:
     session_id: str
     user_id: str
-    created_at: datetime
-    expires_at: datetime
+    created_at: float
+    expires_at: float
     ip_address: str
     user_agent: str
     is_active: bool
@@ -51,33 +96,125 @@ class AuthenticationManager:
         self.data_dir = Path("/app/data/auth")
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Initialize encryption
-        self.cipher = self._init_encryption()
+        # Initialize encryption: the stored Fernet key wraps an AES-GCM data key
+        self.legacy_cipher = self._init_encryption()
+        self.cipher = self._init_data_cipher()
 
-        # Password hashing
+        # Password hashing; bcrypt releases the GIL while hashing, so async
+        # callers offload verification to a thread pool to use every core
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self._bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
 
         # JWT settings
         self.jwt_secret = self._get_jwt_secret()
         self.jwt_algorithm = "HS256"
-        self.jwt_expiry = timedelta(hours=24)
+        self._jwt_secret_bytes = self.jwt_secret.encode()
+        self._jwt_header_b64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+        self.jwt_expiry = 24 * 3600
+
+        # API keys are stored only as keyed BLAKE2b digests
+        self.api_key_secret = self._get_api_key_secret()
+
+        # Verified JWT payloads: blake2b(generation + token) -> (exp, payload)
+        self.jwt_cache_size = 4096
+        self._jwt_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+        # Bumped on every revocation so cached auth decisions are discarded
+        self.auth_generation = 0
+
+        # Random bytes are drawn from the OS in blocks and handed out per token.
+        # Sync endpoints run in the threadpool, so the pool is lock-protected
+        self._rand_pool = b""
+        self._rand_pos = 0
+        self._rand_lock = threading.Lock()
+
+        # Session settings
+        self.session_expiry = 24 * 3600
+        self.strict_session_ip = os.getenv("STRICT_SESSION_IP", "false").lower() == "true"
 
         # User database (in production, use encrypted file or secure database)
         self.users_file = self.data_dir / "users.enc"
         self.sessions_file = self.data_dir / "sessions.enc"
-
-        # Rate limiting
-        self.rate_limits = {}
-        self.failed_attempts = {}
-
-        # Load existing data
-        self.users = self._load_users()
-        self.sessions = self._load_sessions()
+        self.journal_file = self.data_dir / "auth.journal"
+        self.journal_compact_size = 1024 * 1024
+
+        # Rate limiting: key -> (window, count, previous_window_count)
+        self.rate_window = 3600
+        self.rate_limits: Dict[str, Tuple[int, int, int]] = {}
+        self.failed_attempts: Dict[str, Tuple[int, int, int]] = {}
+
+        # Persistence is batched: mutations mark records dirty and a background
+        # thread appends them to the journal at most once per interval
+        self.flush_interval = 1.0
+        self._dirty_users: Set[str] = set()
+        self._dirty_sessions: Set[str] = set()
+        self._flush_lock = threading.Lock()
+        # Guards the dirty sets only, so mutators never wait on journal I/O
+        self._dirty_lock = threading.Lock()
+
+        # Load existing data (snapshots plus journal)
+        journal = self._read_journal()
+        self.api_key_index: Dict[str, str] = {}
+        self.users = self._load_users(journal["user"])
+        self._sessions_by_user: Dict[str, Set[str]] = defaultdict(set)
+        self._session_expiry: List[Tuple[float, str]] = []
+        self.sessions = self._load_sessions(journal["session"])
 
         # Create default admin user if none exists
         if not self.users:
             self._create_default_admin()
 
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+        atexit.register(self._flush, True)
+
+    def _flush_loop(self):
+        """Periodically persist dirty users and sessions"""
+        while True:
+            time.sleep(self.flush_interval)
+            self._flush()
+
+    def _flush(self, compact: bool = False):
+        """Journal dirty users and sessions, compacting when the journal grows"""
+        with self._flush_lock:
+            with self._dirty_lock:
+                dirty_users, self._dirty_users = self._dirty_users, set()
+                dirty_sessions, self._dirty_sessions = self._dirty_sessions, set()
+
+            try:
+                records = [
+                    {"kind": "user", "id": username, "data": self.users.get(username)}
+                    for username in dirty_users
+                ]
+                records.extend(
+                    {"kind": "session", "id": session_id, "data": self.sessions.get(session_id)}
+                    for session_id in dirty_sessions
+                )
+
+                if records:
+                    self._append_journal(records)
+
+                journal_size = self.journal_file.stat().st_size if self.journal_file.exists() else 0
+                if compact or journal_size > self.journal_compact_size:
+                    self._compact()
+
+            except Exception as e:
+                print(f"Failed to persist auth data: {e}")
+                # Retry the same records on the next flush
+                with self._dirty_lock:
+                    self._dirty_users |= dirty_users
+                    self._dirty_sessions |= dirty_sessions
+
+    def _mark_user_dirty(self, username: str):
+        """Queue a user record for the next journal flush"""
+        with self._dirty_lock:
+            self._dirty_users.add(username)
+
+    def _mark_session_dirty(self, session_id: str):
+        """Queue a session record for the next journal flush"""
+        with self._dirty_lock:
+            self._dirty_sessions.add(session_id)
+
     def _init_encryption(self) -> Fernet:
         """Initialize encryption for user data"""
         key_path = self.data_dir / ".auth_key"
@@ -93,6 +230,35 @@ class AuthenticationManager:
 
         return Fernet(key)
 
+    def _init_data_cipher(self) -> AESGCM:
+        """Derive the AES-GCM data key from the stored encryption key"""
+        key_path = self.data_dir / ".auth_key"
+        with open(key_path, "rb") as f:
+            master_key = f.read()
+
+        data_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"private-llm-auth-data"
+        ).derive(master_key)
+
+        return AESGCM(data_key)
+
+    def _encrypt_data(self, data: bytes) -> bytes:
+        """Seal data with AES-GCM"""
+        nonce = os.urandom(12)
+        return ENCRYPTED_FILE_MAGIC + nonce + self.cipher.encrypt(nonce, data, None)
+
+    def _decrypt_data(self, encrypted_data: bytes) -> bytes:
+        """Open AES-GCM sealed data, falling back to legacy Fernet files"""
+        if bytes(encrypted_data[:len(ENCRYPTED_FILE_MAGIC)]) != ENCRYPTED_FILE_MAGIC:
+            return self.legacy_cipher.decrypt(bytes(encrypted_data))
+
+        offset = len(ENCRYPTED_FILE_MAGIC)
+        nonce = encrypted_data[offset:offset + 12]
+        return self.cipher.decrypt(nonce, encrypted_data[offset + 12:], None)
+
     def _get_jwt_secret(self) -> str:
         """Get or generate JWT secret"""
         secret_path = self.data_dir / ".jwt_secret"
@@ -107,46 +273,160 @@ class AuthenticationManager:
             os.chmod(secret_path, 0o600)
             return secret
 
+    def _get_api_key_secret(self) -> bytes:
+        """Get or generate the key used to hash API keys"""
+        secret_path = self.data_dir / ".api_key_secret"
+
+        if secret_path.exists():
+            with open(secret_path, "rb") as f:
+                return f.read()
+        else:
+            secret = secrets.token_bytes(32)
+            with open(secret_path, "wb") as f:
+                f.write(secret)
+            os.chmod(secret_path, 0o600)
+            return secret
+
+    def _hash_api_key(self, api_key: str) -> str:
+        """Keyed BLAKE2b digest of an API key"""
+        return hashlib.blake2b(
+            api_key.encode(), key=self.api_key_secret, digest_size=16
+        ).hexdigest()
+
     def _create_default_admin(self):
         """Create default admin user"""
         admin_password = os.getenv("ADMIN_PASSWORD", secrets.token_urlsafe(16))
 
+        api_key = self._generate_api_key()
+        api_key_hash = self._hash_api_key(api_key)
         admin_user = User(
             username="admin",
             password_hash=self.pwd_context.hash(admin_password),
-            api_keys=[self._generate_api_key()],
-            permissions=["admin", "chat", "models"],
-            created_at=datetime.utcnow(),
+            api_key_hashes=[api_key_hash],
+            permissions=frozenset(["admin", "chat", "models"]),
+            created_at=time.time(),
             last_login=None,
             is_active=True,
             rate_limit=1000
         )
 
         self.users["admin"] = admin_user
-        self._save_users()
+        self.api_key_index[api_key_hash] = "admin"
+        self._mark_user_dirty("admin")
 
         # Log admin credentials (in production, use secure method)
-        print(f"🔑 Default admin created - Username: admin, Password: {admin_password}")
+        print(f"🔑 Default admin created - Username: admin, Password: {admin_password}, API key: {api_key}")
+
+    def _token(self, nbytes: int = 32) -> str:
+        """URL-safe random token, equivalent to secrets.token_urlsafe"""
+        with self._rand_lock:
+            if self._rand_pos + nbytes > len(self._rand_pool):
+                self._rand_pool = os.urandom(4096)
+                self._rand_pos = 0
+
+            chunk = self._rand_pool[self._rand_pos:self._rand_pos + nbytes]
+            self._rand_pos += nbytes
+
+        return _b64url(chunk).decode()
 
     def _generate_api_key(self) -> str:
         """Generate secure API key"""
-        return f"pllm_{secrets.token_urlsafe(32)}"
+        return f"{API_KEY_PREFIX}{self._token()}"
 
-    def _load_users(self) -> Dict[str, User]:
-        """Load encrypted users from file"""
-        if not self.users_file.exists():
+    def _read_snapshot(self, path: Path) -> Dict[str, dict]:
+        """Map and decrypt a snapshot file without copying it into memory"""
+        if not path.exists() or path.stat().st_size == 0:
             return {}
 
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as encrypted_data:
+                return orjson.loads(self._decrypt_data(encrypted_data))
+
+    def _write_snapshot(self, path: Path, data: bytes):
+        """Encrypt and atomically replace a snapshot file"""
+        tmp_path = path.with_suffix(".tmp")
+
         try:
-            with open(self.users_file, "rb") as f:
-                encrypted_data = f.read()
+            with open(tmp_path, "wb") as f:
+                f.write(self._encrypt_data(data))
 
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            users_data = json.loads(decrypted_data.decode())
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _read_journal(self) -> Dict[str, Dict[str, Optional[dict]]]:
+        """Replay the journal into the latest record per user and session"""
+        latest = {"user": {}, "session": {}}
+        if not self.journal_file.exists() or self.journal_file.stat().st_size == 0:
+            return latest
+
+        try:
+            with open(self.journal_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = 0
+                while offset + 4 <= len(data):
+                    length = int.from_bytes(data[offset:offset + 4], "big")
+                    sealed = data[offset + 4:offset + 4 + length]
+                    if len(sealed) < length:
+                        break  # Torn trailing record
+
+                    record = orjson.loads(self._decrypt_data(sealed))
+                    latest[record["kind"]][record["id"]] = record["data"]
+                    offset += 4 + length
+
+        except Exception as e:
+            print(f"Failed to replay journal: {e}")
+
+        return latest
+
+    def _append_journal(self, records: List[dict]):
+        """Append sealed records to the journal"""
+        with open(self.journal_file, "ab") as f:
+            for record in records:
+                sealed = self._encrypt_data(orjson.dumps(record, default=sorted))
+                f.write(len(sealed).to_bytes(4, "big") + sealed)
+
+        os.chmod(self.journal_file, 0o600)
+
+    def _compact(self):
+        """Fold the journal into fresh snapshots and truncate it"""
+        users_saved = self._save_users()
+        sessions_saved = self._save_sessions()
+
+        # The journal is the only durable copy of recent changes until both
+        # snapshots are written. Replaying it over the new snapshots is
+        # idempotent, so a crash before this point loses nothing
+        if users_saved and sessions_saved:
+            self.journal_file.unlink(missing_ok=True)
+
+    def _load_users(self, journal: Dict[str, Optional[dict]]) -> Dict[str, User]:
+        """Load encrypted users from snapshot and journal"""
+        try:
+            users_data = self._read_snapshot(self.users_file)
+            for username, user_data in journal.items():
+                if user_data is None:
+                    users_data.pop(username, None)
+                else:
+                    users_data[username] = user_data
 
             users = {}
             for username, user_data in users_data.items():
+                user_data["created_at"] = _to_timestamp(user_data["created_at"])
+                if user_data["last_login"]:
+                    user_data["last_login"] = _to_timestamp(user_data["last_login"])
+
+                # Migrate plaintext keys from older files
+                if "api_keys" in user_data:
+                    user_data["api_key_hashes"] = [
+                        self._hash_api_key(api_key) for api_key in user_data.pop("api_keys")
+                    ]
+                    self._mark_user_dirty(username)
+
+                user_data["permissions"] = frozenset(user_data["permissions"])
                 users[username] = User(**user_data)
+                for api_key_hash in users[username].api_key_hashes:
+                    self.api_key_index[api_key_hash] = username
 
             return users
 
@@ -154,56 +434,42 @@ class AuthenticationManager:
             print(f"Failed to load users: {e}")
             return {}
 
-    def _save_users(self):
-        """Save encrypted users to file"""
+    def _save_users(self) -> bool:
+        """Save encrypted users snapshot, returning whether it was written"""
         try:
-            users_data = {}
-            for username, user in self.users.items():
-                users_data[username] = {
-                    "username": user.username,
-                    "password_hash": user.password_hash,
-                    "api_keys": user.api_keys,
-                    "permissions": user.permissions,
-                    "created_at": user.created_at.isoformat(),
-                    "last_login": user.last_login.isoformat() if user.last_login else None,
-                    "is_active": user.is_active,
-                    "rate_limit": user.rate_limit
-                }
-
-            data_str = json.dumps(users_data)
-            encrypted_data = self.cipher.encrypt(data_str.encode())
-
-            with open(self.users_file, "wb") as f:
-                f.write(encrypted_data)
-
-            os.chmod(self.users_file, 0o600)
+            # orjson serializes the dataclasses directly
+            self._write_snapshot(self.users_file, orjson.dumps(self.users, default=sorted))
+            return True
 
         except Exception as e:
             print(f"Failed to save users: {e}")
+            return False
 
-    def _load_sessions(self) -> Dict[str, Session]:
-        """Load encrypted sessions from file"""
-        if not self.sessions_file.exists():
-            return {}
-
+    def _load_sessions(self, journal: Dict[str, Optional[dict]]) -> Dict[str, Session]:
+        """Load encrypted sessions from snapshot and journal"""
         try:
-            with open(self.sessions_file, "rb") as f:
-                encrypted_data = f.read()
-
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            sessions_data = json.loads(decrypted_data.decode())
+            sessions_data = self._read_snapshot(self.sessions_file)
+            for session_id, session_data in journal.items():
+                if session_data is None:
+                    sessions_data.pop(session_id, None)
+                else:
+                    sessions_data[session_id] = session_data
 
             sessions = {}
             for session_id, session_data in sessions_data.items():
                 sessions[session_id] = Session(
                     session_id=session_data["session_id"],
                     user_id=session_data["user_id"],
-                    created_at=datetime.fromisoformat(session_data["created_at"]),
-                    expires_at=datetime.fromisoformat(session_data["expires_at"]),
+                    created_at=_to_timestamp(session_data["created_at"]),
+                    expires_at=_to_timestamp(session_data["expires_at"]),
                     ip_address=session_data["ip_address"],
                     user_agent=session_data["user_agent"],
                     is_active=session_data["is_active"]
                 )
+                self._sessions_by_user[session_data["user_id"]].add(session_id)
+                self._session_expiry.append((sessions[session_id].expires_at, session_id))
+
+            heapq.heapify(self._session_expiry)
 
             return sessions
 
@@ -211,31 +477,15 @@ class AuthenticationManager:
             print(f"Failed to load sessions: {e}")
             return {}
 
-    def _save_sessions(self):
-        """Save encrypted sessions to file"""
+    def _save_sessions(self) -> bool:
+        """Save encrypted sessions snapshot, returning whether it was written"""
         try:
-            sessions_data = {}
-            for session_id, session in self.sessions.items():
-                sessions_data[session_id] = {
-                    "session_id": session.session_id,
-                    "user_id": session.user_id,
-                    "created_at": session.created_at.isoformat(),
-                    "expires_at": session.expires_at.isoformat(),
-                    "ip_address": session.ip_address,
-                    "user_agent": session.user_agent,
-                    "is_active": session.is_active
-                }
-
-            data_str = json.dumps(sessions_data)
-            encrypted_data = self.cipher.encrypt(data_str.encode())
-
-            with open(self.sessions_file, "wb") as f:
-                f.write(encrypted_data)
-
-            os.chmod(self.sessions_file, 0o600)
+            self._write_snapshot(self.sessions_file, orjson.dumps(self.sessions))
+            return True
 
         except Exception as e:
             print(f"Failed to save sessions: {e}")
+            return False
 
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate user with username and password"""
@@ -248,24 +498,52 @@ class AuthenticationManager:
             self._record_failed_attempt(username)
             return None
 
-        # Update last login
-        user.last_login = datetime.utcnow()
-        self._save_users()
+        # Update last login (informational, persisted with the next compaction)
+        user.last_login = time.time()
+
+        return user
+
+    async def authenticate_user_async(self, username: str, password: str) -> Optional[User]:
+        """Authenticate user without blocking the event loop on bcrypt"""
+        user = self.users.get(username)
+
+        if not user or not user.is_active:
+            return None
+
+        loop = asyncio.get_running_loop()
+        verified = await loop.run_in_executor(
+            self._bcrypt_pool, self.pwd_context.verify, password, user.password_hash
+        )
+
+        if not verified:
+            self._record_failed_attempt(username)
+            return None
+
+        # Update last login (informational, persisted with the next compaction)
+        user.last_login = time.time()
 
         return user
 
     def authenticate_api_key(self, api_key: str) -> Optional[User]:
         """Authenticate using API key"""
-        for user in self.users.values():
-            if api_key in user.api_keys and user.is_active:
-                return user
+        # Reject malformed keys before hashing
+        if len(api_key) != API_KEY_LENGTH or not api_key.startswith(API_KEY_PREFIX):
+            return None
 
-        return None
+        username = self.api_key_index.get(self._hash_api_key(api_key))
+        if not username:
+            return None
+
+        user = self.users.get(username)
+        if not user or not user.is_active:
+            return None
+
+        return user
 
     def authenticate_jwt(self, token: str) -> Optional[User]:
         """Authenticate using JWT token"""
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
+            payload = self._decode_jwt(token)
             username = payload.get("sub")
 
             if not username:
@@ -282,32 +560,65 @@ class AuthenticationManager:
         except jwt.InvalidTokenError:
             return None
 
+    def _decode_jwt(self, token: str) -> dict:
+        """Decode a JWT, reusing the verified payload for repeat tokens"""
+        cache_key = hashlib.blake2b(
+            f"{self.auth_generation}:{token}".encode(), digest_size=16
+        ).digest()
+
+        cached = self._jwt_cache.get(cache_key)
+        if cached and cached[0] > time.time():
+            self._jwt_cache.move_to_end(cache_key)
+            return cached[1]
+
+        payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
+
+        self._jwt_cache[cache_key] = (float(payload.get("exp", 0)), payload)
+        if len(self._jwt_cache) > self.jwt_cache_size:
+            self._jwt_cache.popitem(last=False)
+
+        return payload
+
+    def _invalidate_auth_caches(self):
+        """Invalidate cached JWT payloads and bearer-token decisions"""
+        self.auth_generation += 1
+        self._jwt_cache.clear()
+
     def generate_jwt_token(self, user: User) -> str:
         """Generate JWT token for user"""
-        payload = {
+        # Specialized HS256 encoder for our fixed claim set: the header is
+        # precomputed and only the payload is serialized and signed per call
+        iat = int(time.time())
+        payload = orjson.dumps({
             "sub": user.username,
-            "iat": datetime.utcnow(),
-            "exp": datetime.utcnow() + self.jwt_expiry,
-            "permissions": user.permissions
-        }
+            "iat": iat,
+            "exp": iat + self.jwt_expiry,
+            "permissions": sorted(user.permissions)
+        })
+
+        signing_input = self._jwt_header_b64 + b"." + _b64url(payload)
+        signature = hmac.new(self._jwt_secret_bytes, signing_input, hashlib.sha256).digest()
 
-        return jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
+        return (signing_input + b"." + _b64url(signature)).decode()
 
     def create_session(self, user: User, ip_address: str, user_agent: str) -> Session:
         """Create new session for user"""
-        session_id = secrets.token_urlsafe(32)
+        session_id = self._token()
+        now = time.time()
         session = Session(
             session_id=session_id,
             user_id=user.username,
-            created_at=datetime.utcnow(),
-            expires_at=datetime.utcnow() + timedelta(hours=24),
+            created_at=now,
+            expires_at=now + self.session_expiry,
             ip_address=ip_address,
             user_agent=user_agent[:200],  # Truncate user agent
             is_active=True
         )
 
         self.sessions[session_id] = session
-        self._save_sessions()
+        self._sessions_by_user[user.username].add(session_id)
+        heapq.heappush(self._session_expiry, (session.expires_at, session_id))
+        self._mark_session_dirty(session_id)
 
         return session
 
@@ -318,100 +629,136 @@ class AuthenticationManager:
         if not session or not session.is_active:
             return None
 
-        if datetime.utcnow() > session.expires_at:
+        if time.time() > session.expires_at:
             session.is_active = False
-            self._save_sessions()
+            self._mark_session_dirty(session_id)
             return None
 
         # Verify IP address (optional strict mode)
-        if os.getenv("STRICT_SESSION_IP", "false") == "true":
-            if session.ip_address != ip_address:
-                return None
+        if self.strict_session_ip and session.ip_address != ip_address:
+            return None
 
         return session
 
     def revoke_session(self, session_id: str):
         """Revoke session"""
         if session_id in self.sessions:
-            self.sessions[session_id].is_active = False
-            self._save_sessions()
+            session = self.sessions[session_id]
+            session.is_active = False
+            self._discard_user_session(session.user_id, session_id)
+            self._mark_session_dirty(session_id)
+            self._invalidate_auth_caches()
+
+    def _rotate_window(self, entry: Optional[Tuple[int, int, int]], now: float) -> Tuple[int, int, int]:
+        """Advance a fixed-window counter to the window containing now"""
+        window = int(now // self.rate_window)
+
+        if entry is None:
+            return (window, 0, 0)
+
+        current_window, count, _ = entry
+        if window == current_window:
+            return entry
+        if window == current_window + 1:
+            return (window, 0, count)
+
+        return (window, 0, 0)
+
+    def _window_total(self, entry: Tuple[int, int, int], now: float) -> float:
+        """Approximate sliding-window count from current and previous windows"""
+        _, count, previous_count = entry
+        remaining = (self.rate_window - now % self.rate_window) / self.rate_window
+        return count + previous_count * remaining
+
+    def _discard_user_session(self, username: str, session_id: str):
+        """Remove a session from the per-user index"""
+        user_sessions = self._sessions_by_user.get(username)
+        if user_sessions is None:
+            return
+
+        user_sessions.discard(session_id)
+        if not user_sessions:
+            del self._sessions_by_user[username]
 
     def _record_failed_attempt(self, identifier: str):
         """Record failed authentication attempt"""
         now = time.time()
-        if identifier not in self.failed_attempts:
-            self.failed_attempts[identifier] = []
-
-        # Clean old attempts (older than 1 hour)
-        self.failed_attempts[identifier] = [
-            attempt for attempt in self.failed_attempts[identifier]
-            if now - attempt < 3600
-        ]
-
-        self.failed_attempts[identifier].append(now)
+        window, count, previous_count = self._rotate_window(self.failed_attempts.get(identifier), now)
+        self.failed_attempts[identifier] = (window, count + 1, previous_count)
 
     def is_blocked(self, identifier: str) -> bool:
         """Check if identifier is blocked due to failed attempts"""
-        if identifier not in self.failed_attempts:
+        entry = self.failed_attempts.get(identifier)
+        if entry is None:
             return False
 
+        now = time.time()
+        entry = self._rotate_window(entry, now)
+
         # Block after 5 failed attempts in 1 hour
-        return len(self.failed_attempts[identifier]) >= 5
+        return self._window_total(entry, now) >= 5
 
     def check_rate_limit(self, user: User, endpoint: str) -> bool:
         """Check rate limiting for user"""
         now = time.time()
         key = f"{user.username}:{endpoint}"
-
-        if key not in self.rate_limits:
-            self.rate_limits[key] = []
-
-        # Clean old requests (older than 1 hour)
-        self.rate_limits[key] = [
-            req_time for req_time in self.rate_limits[key]
-            if now - req_time < 3600
-        ]
+        entry = self._rotate_window(self.rate_limits.get(key), now)
 
         # Check limit
-        if len(self.rate_limits[key]) >= user.rate_limit:
+        if self._window_total(entry, now) >= user.rate_limit:
+            self.rate_limits[key] = entry
             return False
 
-        self.rate_limits[key].append(now)
+        window, count, previous_count = entry
+        self.rate_limits[key] = (window, count + 1, previous_count)
         return True
 
-    def create_user(self, username: str, password: str, permissions: List[str]) -> User:
-        """Create new user"""
+    def _compact_rate_limits(self):
+        """Drop rate-limit and failed-attempt counters older than the previous window"""
+        oldest_window = int(time.time() // self.rate_window) - 1
+        for table in (self.rate_limits, self.failed_attempts):
+            stale = [key for key, (window, _, _) in table.items() if window < oldest_window]
+            for key in stale:
+                del table[key]
+
+    def create_user(self, username: str, password: str, permissions: List[str]) -> Tuple[User, str]:
+        """Create new user, returning the user and their initial API key"""
         if username in self.users:
             raise ValueError("User already exists")
 
+        api_key = self._generate_api_key()
+        api_key_hash = self._hash_api_key(api_key)
         user = User(
             username=username,
             password_hash=self.pwd_context.hash(password),
-            api_keys=[self._generate_api_key()],
-            permissions=permissions,
-            created_at=datetime.utcnow(),
+            api_key_hashes=[api_key_hash],
+            permissions=frozenset(permissions),
+            created_at=time.time(),
             last_login=None,
             is_active=True,
             rate_limit=100
         )
 
         self.users[username] = user
-        self._save_users()
+        self.api_key_index[api_key_hash] = username
+        self._mark_user_dirty(username)
 
-        return user
+        # The plaintext key is only available here
+        return user, api_key
 
     def delete_user(self, username: str):
         """Delete user"""
         if username in self.users:
+            for api_key_hash in self.users[username].api_key_hashes:
+                self.api_key_index.pop(api_key_hash, None)
             del self.users[username]
-            self._save_users()
+            self._mark_user_dirty(username)
+            self._invalidate_auth_caches()
 
             # Revoke all sessions for user
-            for session in self.sessions.values():
-                if session.user_id == username:
-                    session.is_active = False
-
-            self._save_sessions()
+            for session_id in self._sessions_by_user.pop(username, ()):
+                self.sessions[session_id].is_active = False
+                self._mark_session_dirty(session_id)
 
     def generate_new_api_key(self, username: str) -> str:
         """Generate new API key for user"""
@@ -420,8 +767,10 @@ class AuthenticationManager:
             raise ValueError("User not found")
 
         new_key = self._generate_api_key()
-        user.api_keys.append(new_key)
-        self._save_users()
+        new_key_hash = self._hash_api_key(new_key)
+        user.api_key_hashes.append(new_key_hash)
+        self.api_key_index[new_key_hash] = username
+        self._mark_user_dirty(username)
 
         return new_key
 
@@ -431,25 +780,30 @@ class AuthenticationManager:
         if not user:
             return
 
-        if api_key in user.api_keys:
-            user.api_keys.remove(api_key)
-            self._save_users()
+        api_key_hash = self._hash_api_key(api_key)
+        if api_key_hash in user.api_key_hashes:
+            user.api_key_hashes.remove(api_key_hash)
+            self.api_key_index.pop(api_key_hash, None)
+            self._mark_user_dirty(username)
+            self._invalidate_auth_caches()
 
     def cleanup_expired_sessions(self):
         """Clean up expired sessions"""
-        now = datetime.utcnow()
-        expired_sessions = [
-            session_id for session_id, session in self.sessions.items()
-            if session.expires_at < now
-        ]
+        now = time.time()
+        expired_count = 0
 
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
+        # Sessions sit in a min-heap by expiry, so only expired entries are visited
+        while self._session_expiry and self._session_expiry[0][0] < now:
+            _, session_id = heapq.heappop(self._session_expiry)
+            session = self.sessions.pop(session_id, None)
+            if session:
+                self._discard_user_session(session.user_id, session_id)
+                self._mark_session_dirty(session_id)
+                expired_count += 1
 
-        if expired_sessions:
-            self._save_sessions()
+        self._compact_rate_limits()
 
-        return len(expired_sessions)
+        return expired_count
 
     def get_user_info(self, username: str) -> Optional[Dict]:
         """Get user information (sanitized)"""
@@ -459,23 +813,24 @@ class AuthenticationManager:
 
         return {
             "username": user.username,
-            "permissions": user.permissions,
-            "created_at": user.created_at.isoformat(),
-            "last_login": user.last_login.isoformat() if user.last_login else None,
+            "permissions": sorted(user.permissions),
+            "created_at": _isoformat(user.created_at),
+            "last_login": _isoformat(user.last_login) if user.last_login else None,
             "is_active": user.is_active,
-            "api_key_count": len(user.api_keys),
+            "api_key_count": len(user.api_key_hashes),
             "rate_limit": user.rate_limit
         }
 
     def get_active_sessions(self, username: str) -> List[Dict]:
         """Get active sessions for user"""
         sessions = []
-        for session in self.sessions.values():
-            if session.user_id == username and session.is_active:
+        for session_id in self._sessions_by_user.get(username, ()):
+            session = self.sessions[session_id]
+            if session.is_active:
                 sessions.append({
                     "session_id": session.session_id[:8] + "...",  # Partial ID for security
-                    "created_at": session.created_at.isoformat(),
-                    "expires_at": session.expires_at.isoformat(),
+                    "created_at": _isoformat(session.created_at),
+                    "expires_at": _isoformat(session.expires_at),
                     "ip_address": session.ip_address,
                     "user_agent": session.user_agent[:50] + "..." if len(session.user_agent) > 50 else session.user_agent
                 })
@@ -487,11 +842,42 @@ class AuthenticationManager:
 class AuthenticationRequired:
     """Authentication decorator class"""
 
-    def __init__(self, auth_manager: AuthenticationManager):
+    def __init__(self, auth_manager: AuthenticationManager, decision_ttl: float = 2.0):
         self.auth_manager = auth_manager
 
+        # Short-lived bearer token decisions: blake2b(token) -> (valid_until, generation, user)
+        self.decision_ttl = decision_ttl
+        self.decision_cache_size = 4096
+        self._decision_cache: "OrderedDict[bytes, Tuple[float, int, User]]" = OrderedDict()
+
+    def _authenticate_token(self, token: str) -> Optional[User]:
+        """Authenticate a bearer token, reusing recent decisions for the same token"""
+        now = time.time()
+        generation = self.auth_manager.auth_generation
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+        cached = self._decision_cache.get(cache_key)
+        if cached and cached[0] > now and cached[1] == generation:
+            self._decision_cache.move_to_end(cache_key)
+            return cached[2]
+
+        # Dispatch on token shape so only one scheme is attempted
+        user = None
+        if token.startswith(API_KEY_PREFIX):
+            user = self.auth_manager.authenticate_api_key(token)
+        elif token.count(".") == 2:
+            user = self.auth_manager.authenticate_jwt(token)
+
+        if user:
+            self._decision_cache[cache_key] = (now + self.decision_ttl, generation, user)
+            if len(self._decision_cache) > self.decision_cache_size:
+                self._decision_cache.popitem(last=False)
+
+        return user
+
     def __call__(self, permissions: List[str] = None):
         """Authentication decorator with optional permissions check"""
+        required_permissions = frozenset(permissions) if permissions else None
 
         def decorator(func):
             async def wrapper(request: Request, *args, **kwargs):
@@ -503,14 +889,7 @@ class AuthenticationRequired:
 
                 # Try API key authentication
                 if auth_header and auth_header.startswith("Bearer "):
-                    token = auth_header[7:]
-
-                    # Try JWT first
-                    user = self.auth_manager.authenticate_jwt(token)
-
-                    # If JWT fails, try API key
-                    if not user:
-                        user = self.auth_manager.authenticate_api_key(token)
+                    user = self._authenticate_token(auth_header[7:])
 
                 # Try session authentication
                 elif session_cookie:
@@ -524,9 +903,8 @@ class AuthenticationRequired:
                     raise HTTPException(status_code=401, detail="Authentication required")
 
                 # Check permissions
-                if permissions:
-                    if not any(perm in user.permissions for perm in permissions):
-                        raise HTTPException(status_code=403, detail="Insufficient permissions")
+                if required_permissions and required_permissions.isdisjoint(user.permissions):
+                    raise HTTPException(status_code=403, detail="Insufficient permissions")
 
                 # Check rate limiting
                 if not self.auth_manager.check_rate_limit(user, request.url.path):
@@ -5,20 +5,25 @@ OpenAI-compatible API with maximum privacy and security
 """
 
 import os
-import json
 import time
 import hmac
 import hashlib
+import secrets
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import ipaddress
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
+from functools import cached_property
 
 import httpx
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -27,6 +32,26 @@ from cryptography.fernet import Fernet
 import structlog
 
 
+# Static root payload, encoded once
+ROOT_RESPONSE = orjson.dumps({"status": "Private LLM API", "privacy_mode": "maximum"})
+
+# Server-sent event frames for streamed chat completions
+STREAM_ERROR_EVENT = b"data: " + orjson.dumps({"error": "Ollama request failed"}) + b"\n\n"
+STREAM_DONE_EVENT = b"data: [DONE]\n\n"
+
+# Formatted UTC timestamp, refreshed at most once per second
+_timestamp_cache = [0, ""]
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with second resolution"""
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+    return _timestamp_cache[1]
+
+
 # Request/Response Models (OpenAI Compatible)
 class ChatMessage(BaseModel):
     role: str = Field(..., description="Message role: system, user, or assistant")
@@ -73,31 +98,61 @@ class SecurityConfig:
 class RateLimiter:
     """Token bucket rate limiter"""
 
-    def __init__(self, requests_per_window: int, window_seconds: int):
+    SHARD_COUNT = 16
+
+    def __init__(self, requests_per_window: int, window_seconds: int, max_entries: int = 50000):
         self.requests_per_window = requests_per_window
         self.window_seconds = window_seconds
-        self.requests = {}
+        self.refill_rate = requests_per_window / window_seconds
+        self.max_entries_per_shard = max(1, max_entries // self.SHARD_COUNT)
+
+        # Buckets are sharded by identifier hash so each table stays small and
+        # can later be guarded by its own lock if checks move off the event loop.
+        # Each shard maps identifier -> (tokens, last_refill), least recently seen first
+        self.shards: List["OrderedDict[str, Tuple[float, float]]"] = [
+            OrderedDict() for _ in range(self.SHARD_COUNT)
+        ]
 
     def is_allowed(self, identifier: str) -> bool:
-        now = time.time()
-        window_start = now - self.window_seconds
-
-        # Clean old entries
-        if identifier in self.requests:
-            self.requests[identifier] = [
-                req_time for req_time in self.requests[identifier]
-                if req_time > window_start
-            ]
-        else:
-            self.requests[identifier] = []
+        now = time.monotonic()
+        capacity = self.requests_per_window
+        buckets = self.shards[hash(identifier) & (self.SHARD_COUNT - 1)]
+        tokens, last = buckets.get(identifier, (capacity, now))
 
-        # Check rate limit
-        if len(self.requests[identifier]) >= self.requests_per_window:
-            return False
+        # Lazily refill for the time elapsed since the last check
+        tokens = min(capacity, tokens + (now - last) * self.refill_rate)
+
+        allowed = tokens >= 1.0
+        buckets[identifier] = (tokens - 1.0 if allowed else tokens, now)
+        buckets.move_to_end(identifier)
+
+        # Bound memory under client churn
+        if len(buckets) > self.max_entries_per_shard:
+            buckets.popitem(last=False)
+
+        return allowed
 
-        # Add current request
-        self.requests[identifier].append(now)
-        return True
+    def collect_idle(self) -> int:
+        """Drop buckets idle for a full window; they would be full again anyway"""
+        cutoff = time.monotonic() - self.window_seconds
+        removed = 0
+
+        for buckets in self.shards:
+            # Buckets are ordered by last use, so stop at the first recent one
+            while buckets:
+                identifier, (_, last) = next(iter(buckets.items()))
+                if last > cutoff:
+                    break
+                del buckets[identifier]
+                removed += 1
+
+        return removed
+
+    async def gc_loop(self):
+        """Periodically drop idle buckets"""
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            self.collect_idle()
 
 
 class SecurityMiddleware:
@@ -109,10 +164,35 @@ class SecurityMiddleware:
             config.rate_limit_requests,
             config.rate_limit_window
         )
-        self.cipher = self._init_encryption() if config.enable_encryption else None
+        self.allowed_networks, self.allowed_prefixes = self._compile_allowlist(config.allowed_ips)
+        self._expected_key_digest = self._key_digest(config.api_key)
+
+    @staticmethod
+    def _key_digest(api_key: str) -> bytes:
+        """Fixed-length digest used for API key comparison"""
+        return hashlib.blake2b(api_key.encode(), digest_size=32).digest()
+
+    @staticmethod
+    def _compile_allowlist(allowed_ips: List[str]):
+        """Parse the allowlist into networks, keeping unparseable entries as prefixes"""
+        networks = []
+        prefixes = []
+
+        for entry in allowed_ips:
+            entry = entry.strip()
+            try:
+                networks.append(ipaddress.ip_network(entry, strict=False))
+            except ValueError:
+                prefixes.append(entry)
+
+        return tuple(networks), tuple(prefixes)
+
+    @cached_property
+    def cipher(self) -> Optional[Fernet]:
+        """Encryption for request/response, initialized on first use"""
+        if not self.config.enable_encryption:
+            return None
 
-    def _init_encryption(self) -> Optional[Fernet]:
-        """Initialize encryption for request/response"""
         key_path = Path("/app/data/.api_encryption_key")
 
         if key_path.exists():
@@ -131,21 +211,24 @@ class SecurityMiddleware:
         if not self.config.allowed_ips:
             return True
 
-        for allowed_ip in self.config.allowed_ips:
-            if client_ip == allowed_ip or client_ip.startswith(allowed_ip):
-                return True
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            address = None
+
+        if address is not None and any(address in network for network in self.allowed_networks):
+            return True
 
-        return False
+        return client_ip.startswith(self.allowed_prefixes) if self.allowed_prefixes else False
 
     def verify_api_key(self, credentials: HTTPAuthorizationCredentials) -> bool:
         """Verify API key using constant-time comparison"""
         if not credentials or not credentials.credentials:
             return False
 
-        provided_key = credentials.credentials
-        expected_key = self.config.api_key
+        provided_digest = self._key_digest(credentials.credentials)
 
-        return hmac.compare_digest(provided_key, expected_key)
+        return hmac.compare_digest(provided_digest, self._expected_key_digest)
 
     def check_rate_limit(self, identifier: str) -> bool:
         """Check rate limiting"""
@@ -160,6 +243,13 @@ class AuditLogger:
         self.log_file = Path("/app/logs/api-audit.jsonl")
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Entries are queued by the request path and written by a background
+        # task; when the queue is full new entries are dropped, not awaited
+        self.log_fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
+        self.batch_size = 256
+        self.dropped = 0
+
         # Setup structured logging
         structlog.configure(
             processors=[
@@ -180,7 +270,7 @@ class AuditLogger:
 
         # Extract minimal information for privacy
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(),
             "method": request.method,
             "path": request.url.path,
             "status": response_status,
@@ -191,8 +281,35 @@ class AuditLogger:
         }
 
         # Write to local log file only
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        try:
+            self.queue.put_nowait(orjson.dumps(log_entry) + b"\n")
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def _take_pending(self, first: Optional[bytes] = None) -> bytes:
+        """Pop up to batch_size queued entries as one buffer (event loop side)"""
+        batch = [first] if first is not None else []
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return b"".join(batch)
+
+    def _write_all(self, data: bytes):
+        """Write the whole buffer, continuing after short writes"""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.log_fd, view):]
+
+    async def writer(self):
+        """Drain the audit queue until cancelled"""
+        try:
+            while True:
+                data = self._take_pending(await self.queue.get())
+                # Disk writes run off the event loop thread
+                await asyncio.to_thread(self._write_all, data)
+        finally:
+            # Flush whatever is left on shutdown
+            while not self.queue.empty():
+                self._write_all(self._take_pending())
 
 
 class PrivateLLMAPI:
@@ -204,7 +321,9 @@ class PrivateLLMAPI:
             description="Privacy-focused OpenAI-compatible API",
             version="1.0.0",
             docs_url="/docs" if os.getenv("DEBUG_MODE") == "true" else None,
-            redoc_url=None
+            redoc_url=None,
+            default_response_class=ORJSONResponse,
+            lifespan=self._lifespan
         )
 
         # Load configuration
@@ -212,18 +331,62 @@ class PrivateLLMAPI:
         self.security = SecurityMiddleware(self.config)
         self.audit_logger = AuditLogger(self.config)
 
+        # Model list cache: (fetched_at, response)
+        self.models_cache_ttl = 30.0
+        self._models_cache: Optional[Tuple[float, ModelsResponse]] = None
+
+        # Last time Ollama answered a real request; recent successes stand in
+        # for the /health probe
+        self.health_probe_skip_seconds = 10.0
+        self._last_ollama_ok = float("-inf")
+
+        # Batch requests are capped and fan out no wider than Ollama serves in parallel
+        self.max_batch_size = int(os.getenv("MAX_BATCH_SIZE", "16"))
+        self._batch_slots = asyncio.Semaphore(int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+
         # Setup middleware
         self._setup_middleware()
 
         # Setup routes
         self._setup_routes()
 
-        # Ollama client
-        self.ollama_client = httpx.AsyncClient(
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Own a single Ollama client for the lifetime of the process"""
+        # Pooled keep-alive connections, HTTP/2 when offered
+        app.state.ollama_client = httpx.AsyncClient(
             base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
-            timeout=300.0
+            timeout=httpx.Timeout(300.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=64,
+                max_connections=256,
+                keepalive_expiry=90.0
+            ),
+            http2=True
         )
 
+        logging.getLogger(__name__).info(
+            "Ollama parallelism: OLLAMA_NUM_PARALLEL=%s OLLAMA_MAX_LOADED_MODELS=%s",
+            os.getenv("OLLAMA_NUM_PARALLEL", "default"),
+            os.getenv("OLLAMA_MAX_LOADED_MODELS", "default")
+        )
+
+        rate_limiter_gc = asyncio.create_task(self.security.rate_limiter.gc_loop())
+        audit_writer = asyncio.create_task(self.audit_logger.writer())
+
+        try:
+            yield
+        finally:
+            rate_limiter_gc.cancel()
+            audit_writer.cancel()
+            await asyncio.gather(audit_writer, return_exceptions=True)
+            await app.state.ollama_client.aclose()
+
+    @property
+    def ollama_client(self) -> httpx.AsyncClient:
+        """Shared Ollama client created by the application lifespan"""
+        return self.app.state.ollama_client
+
     def _load_config(self) -> SecurityConfig:
         """Load security configuration"""
         return SecurityConfig(
@@ -266,15 +429,20 @@ class PrivateLLMAPI:
             if not self.security.verify_ip(client_ip):
                 raise HTTPException(status_code=403, detail="IP not allowed")
 
+            # Check request size before rate limiting so rejected requests
+            # do not consume rate-limit tokens
+            try:
+                content_length = int(request.headers.get("content-length", 0))
+            except ValueError:
+                content_length = 0
+
+            if content_length > self.config.max_request_size:
+                raise HTTPException(status_code=413, detail="Request too large")
+
             # Check rate limiting
             if not self.security.check_rate_limit(client_ip):
                 raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-            # Check request size
-            content_length = request.headers.get("content-length")
-            if content_length and int(content_length) > self.config.max_request_size:
-                raise HTTPException(status_code=413, detail="Request too large")
-
             # Process request
             response = await call_next(request)
 
@@ -296,28 +464,35 @@ class PrivateLLMAPI:
 
         @self.app.get("/")
         async def root():
-            return {"status": "Private LLM API", "privacy_mode": "maximum"}
+            return Response(content=ROOT_RESPONSE, media_type="application/json")
 
         @self.app.get("/v1/models", response_model=ModelsResponse)
         async def list_models(auth: HTTPAuthorizationCredentials = Depends(verify_auth)):
             """List available models"""
+            if self._models_cache and time.monotonic() - self._models_cache[0] < self.models_cache_ttl:
+                return self._models_cache[1]
+
             try:
                 response = await self.ollama_client.get("/api/tags")
                 ollama_models = response.json()
 
+                created = int(time.time())
                 models = []
                 for model in ollama_models.get("models", []):
                     models.append({
                         "id": model["name"],
                         "object": "model",
-                        "created": int(time.time()),
+                        "created": created,
                         "owned_by": "private-llm",
                         "permission": [],
                         "root": model["name"],
                         "parent": None
                     })
 
-                return ModelsResponse(data=models)
+                models_response = ModelsResponse(data=models)
+                self._models_cache = (time.monotonic(), models_response)
+
+                return models_response
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed to list models: {str(e)}")
@@ -330,58 +505,50 @@ class PrivateLLMAPI:
             """OpenAI-compatible chat completions endpoint"""
             try:
                 # Convert OpenAI format to Ollama format
-                ollama_request = {
-                    "model": request.model,
-                    "messages": [{"role": msg.role, "content": msg.content} for msg in request.messages],
-                    "stream": request.stream,
-                    "options": {}
-                }
+                ollama_request = self._to_ollama_request(request)
 
-                # Map OpenAI parameters to Ollama options
-                if request.temperature is not None:
-                    ollama_request["options"]["temperature"] = request.temperature
+                # Relay tokens as they are generated
+                if request.stream:
+                    return StreamingResponse(
+                        self._stream_chat(request.model, ollama_request),
+                        media_type="text/event-stream"
+                    )
 
-                if request.max_tokens is not None:
-                    ollama_request["options"]["num_predict"] = request.max_tokens
+                return await self._complete_chat(request.model, ollama_request)
 
-                if request.top_p is not None:
-                    ollama_request["options"]["top_p"] = request.top_p
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Chat completion failed: {str(e)}")
 
-                if request.stop:
-                    ollama_request["options"]["stop"] = request.stop
+        @self.app.post("/v1/chat/completions/batch", response_model=List[ChatCompletionResponse])
+        async def chat_completions_batch(
+            requests: List[ChatCompletionRequest],
+            http_request: Request,
+            auth: HTTPAuthorizationCredentials = Depends(verify_auth)
+        ):
+            """Run several non-streaming chat completions concurrently"""
+            if len(requests) > self.max_batch_size:
+                raise HTTPException(status_code=400, detail=f"Batch exceeds {self.max_batch_size} requests")
 
-                # Send request to Ollama
-                response = await self.ollama_client.post("/api/chat", json=ollama_request)
+            # The middleware charged one rate-limit token; each further item costs another
+            client_ip = http_request.client.host if http_request.client else "unknown"
+            for _ in range(len(requests) - 1):
+                if not self.security.check_rate_limit(client_ip):
+                    raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail="Ollama request failed")
-
-                ollama_response = response.json()
-
-                # Convert Ollama response to OpenAI format
-                openai_response = ChatCompletionResponse(
-                    id=f"chatcmpl-{int(time.time())}",
-                    created=int(time.time()),
-                    model=request.model,
-                    choices=[{
-                        "index": 0,
-                        "message": {
-                            "role": "assistant",
-                            "content": ollama_response.get("message", {}).get("content", "")
-                        },
-                        "finish_reason": "stop"
-                    }],
-                    usage={
-                        "prompt_tokens": ollama_response.get("prompt_eval_count", 0),
-                        "completion_tokens": ollama_response.get("eval_count", 0),
-                        "total_tokens": ollama_response.get("prompt_eval_count", 0) + ollama_response.get("eval_count", 0)
-                    }
-                )
+            try:
+                ollama_requests = []
+                for request in requests:
+                    ollama_request = self._to_ollama_request(request)
+                    ollama_request["stream"] = False
+                    ollama_requests.append((request.model, ollama_request))
 
-                return openai_response
+                return await asyncio.gather(*(
+                    self._complete_chat_bounded(model, ollama_request)
+                    for model, ollama_request in ollama_requests
+                ))
 
             except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Chat completion failed: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"Batch chat completion failed: {str(e)}")
 
         @self.app.post("/v1/completions")
         async def completions(
@@ -389,16 +556,45 @@ class PrivateLLMAPI:
             auth: HTTPAuthorizationCredentials = Depends(verify_auth)
         ):
             """Legacy completions endpoint"""
-            # Convert to chat format and redirect
-            chat_request = ChatCompletionRequest(
-                model=request.get("model"),
-                messages=[ChatMessage(role="user", content=request.get("prompt", ""))],
-                temperature=request.get("temperature", 0.7),
-                max_tokens=request.get("max_tokens"),
-                stream=request.get("stream", False)
+            model = request.get("model")
+            if not isinstance(model, str):
+                raise HTTPException(status_code=400, detail="model is required")
+
+            # The raw dict skips Pydantic, so apply ChatCompletionRequest's bounds here
+            prompt = request.get("prompt", "")
+            if not isinstance(prompt, str):
+                raise HTTPException(status_code=400, detail="prompt must be a string")
+
+            temperature = request.get("temperature", 0.7)
+            if temperature is not None and (
+                isinstance(temperature, bool) or not isinstance(temperature, (int, float))
+                or not 0 <= temperature <= 2
+            ):
+                raise HTTPException(status_code=400, detail="temperature must be a number between 0 and 2")
+
+            max_tokens = request.get("max_tokens")
+            if max_tokens is not None and (
+                isinstance(max_tokens, bool) or not isinstance(max_tokens, int) or max_tokens < 1
+            ):
+                raise HTTPException(status_code=400, detail="max_tokens must be a positive integer")
+
+            # Convert the prompt to a single-message chat; the legacy endpoint
+            # always returns a complete response
+            ollama_request = self._build_ollama_request(
+                model,
+                [{"role": "user", "content": prompt}],
+                False,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1.0
             )
 
-            response = await chat_completions(chat_request, auth)
+            try:
+                response = await self._complete_chat(model, ollama_request)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Chat completion failed: {str(e)}")
 
             # Convert back to completions format
             return {
@@ -418,13 +614,16 @@ class PrivateLLMAPI:
         async def health_check():
             """Health check endpoint"""
             try:
-                # Check Ollama connection
-                response = await self.ollama_client.get("/api/tags", timeout=5.0)
-                ollama_status = "healthy" if response.status_code == 200 else "unhealthy"
+                # Check Ollama connection unless a chat call just succeeded
+                if time.monotonic() - self._last_ollama_ok < self.health_probe_skip_seconds:
+                    ollama_status = "healthy"
+                else:
+                    response = await self.ollama_client.get("/api/tags", timeout=5.0)
+                    ollama_status = "healthy" if response.status_code == 200 else "unhealthy"
 
                 return {
                     "status": "healthy",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": iso_now(),
                     "services": {
                         "ollama": ollama_status,
                         "api": "healthy"
@@ -439,16 +638,17 @@ class PrivateLLMAPI:
         async def emergency_purge(auth: HTTPAuthorizationCredentials = Depends(verify_auth)):
             """Emergency data purge endpoint"""
             try:
-                # This would trigger the emergency purge script
-                import subprocess
-                result = subprocess.run(
-                    ["/app/scripts/emergency-purge.sh"],
-                    input="PURGE_ALL_DATA\n",
-                    text=True,
-                    capture_output=True
+                # This would trigger the emergency purge script; run it without
+                # blocking the event loop
+                process = await asyncio.create_subprocess_exec(
+                    "/app/scripts/emergency-purge.sh",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
                 )
+                await process.communicate(b"PURGE_ALL_DATA\n")
 
-                if result.returncode == 0:
+                if process.returncode == 0:
                     return {"status": "success", "message": "Emergency purge completed"}
                 else:
                     raise HTTPException(status_code=500, detail="Purge failed")
@@ -456,9 +656,120 @@ class PrivateLLMAPI:
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Emergency purge failed: {str(e)}")
 
-    async def shutdown(self):
-        """Cleanup on shutdown"""
-        await self.ollama_client.aclose()
+    @staticmethod
+    def _build_ollama_request(
+        model: str,
+        messages: List[Dict[str, str]],
+        stream: bool,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Build an Ollama chat payload from OpenAI-style parameters"""
+        # Map OpenAI parameters to Ollama options
+        options = (
+            ("temperature", temperature),
+            ("num_predict", max_tokens),
+            ("top_p", top_p),
+            ("stop", stop or None)
+        )
+
+        return {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "options": {key: value for key, value in options if value is not None}
+        }
+
+    def _to_ollama_request(self, request: ChatCompletionRequest) -> Dict[str, Any]:
+        """Convert an OpenAI chat request to Ollama format"""
+        return self._build_ollama_request(
+            request.model,
+            request.model_dump(include={"messages"})["messages"],
+            request.stream,
+            request.temperature,
+            request.max_tokens,
+            request.top_p,
+            request.stop
+        )
+
+    async def _complete_chat(self, model: str, ollama_request: Dict[str, Any]) -> ChatCompletionResponse:
+        """Run a non-streaming chat request against Ollama"""
+        # Send request to Ollama
+        response = await self.ollama_client.post("/api/chat", json=ollama_request)
+
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail="Ollama request failed")
+
+        self._last_ollama_ok = time.monotonic()
+        ollama_response = response.json()
+
+        # Convert Ollama response to OpenAI format
+        openai_response = ChatCompletionResponse(
+            id=f"chatcmpl-{secrets.token_hex(8)}",
+            created=int(time.time()),
+            model=model,
+            choices=[{
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": ollama_response.get("message", {}).get("content", "")
+                },
+                "finish_reason": "stop"
+            }],
+            usage={
+                "prompt_tokens": ollama_response.get("prompt_eval_count", 0),
+                "completion_tokens": ollama_response.get("eval_count", 0),
+                "total_tokens": ollama_response.get("prompt_eval_count", 0) + ollama_response.get("eval_count", 0)
+            }
+        )
+
+        return openai_response
+
+    async def _complete_chat_bounded(self, model: str, ollama_request: Dict[str, Any]) -> ChatCompletionResponse:
+        """_complete_chat holding one of the OLLAMA_NUM_PARALLEL batch slots"""
+        async with self._batch_slots:
+            return await self._complete_chat(model, ollama_request)
+
+    async def _stream_chat(self, model: str, ollama_request: Dict[str, Any]):
+        """Translate Ollama's NDJSON chat stream into OpenAI SSE chunks"""
+        completion_id = f"chatcmpl-{secrets.token_hex(8)}"
+        created = int(time.time())
+
+        try:
+            async with self.ollama_client.stream("POST", "/api/chat", json=ollama_request) as response:
+                if response.status_code != 200:
+                    yield STREAM_ERROR_EVENT
+                else:
+                    self._last_ollama_ok = time.monotonic()
+
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+
+                        ollama_chunk = orjson.loads(line)
+                        done = ollama_chunk.get("done", False)
+                        chunk = {
+                            "id": completion_id,
+                            "object": "chat.completion.chunk",
+                            "created": created,
+                            "model": model,
+                            "choices": [{
+                                "index": 0,
+                                "delta": {} if done else {
+                                    "content": ollama_chunk.get("message", {}).get("content", "")
+                                },
+                                "finish_reason": "stop" if done else None
+                            }]
+                        }
+                        yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+
+        except (httpx.HTTPError, orjson.JSONDecodeError):
+            yield STREAM_ERROR_EVENT
+
+        # OpenAI-style clients wait for the terminator, including after an error
+        yield STREAM_DONE_EVENT
 
 
 # Application factory
@@ -489,6 +800,11 @@ if __name__ == "__main__":
     # Create application
     app = create_app()
 
+    # Prefer uvloop/httptools (installed with uvicorn[standard]) when available
+    import importlib.util
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
     # Run server
     uvicorn.run(
         app,
@@ -496,6 +812,8 @@ if __name__ == "__main__":
         port=args.port,
         workers=args.workers,
         log_level=args.log_level,
+        loop=loop,
+        http=http,
         access_log=False,  # Disable access logs for privacy
         server_header=False,  # Hide server header
         date_header=False  # Hide date header
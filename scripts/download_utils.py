@@ -7,18 +7,33 @@ Incorporates proven aria2c patterns from Ignition project
 import os
 import sys
 import subprocess
-import shutil
 import json
 import time
+import re
 import hashlib
+import hmac
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
-from urllib.parse import urlparse, parse_qs
+from typing import Optional, Tuple, Dict, Any, List
+from urllib.parse import urlparse
 import tempfile
+import threading
 import logging
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Download configuration constants (from Ignition proven patterns)
@@ -30,6 +45,39 @@ ARIA2_TIMEOUT = 30
 ARIA2_MIN_SPLIT_SIZE = "1M"
 PROGRESS_INTERVAL = 5
 MIN_FILE_SIZE_MB = 1
+HASH_BUFFER_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 3600
+SESSION_MAX_FILE_SIZE_MB = 512
+ARIA2_STDERR_TAIL_LINES = 128
+HUGGINGFACE_HOSTS = frozenset({'huggingface.co', 'hf.co'})
+CIVITAI_HOST = 'civitai.com'
+
+# Whole-URL format checks, each a single C-level regex scan
+# Host only: userinfo and port are not part of the _SOURCES key
+_URL_HOST_RE = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?([^:/?#]+)')
+_HUGGINGFACE_URL_RE = re.compile(
+    r'^https?://(?i:huggingface\.co|hf\.co)/(?:(?:datasets|spaces)/)?[^/?#]+/[^/?#]+/resolve/[^/?#]+/[^?#]+'
+)
+_CIVITAI_URL_RE = re.compile(r'^https?://(?i:civitai\.com)/[^?#]*\?(?:[^#]*&)?(?:modelVersionId|id)=[^&#]')
+MANIFEST_FILENAME = '.pllm_manifest.json'
+_manifest_lock = threading.Lock()
+ARIA2_MAX_CONCURRENT_DOWNLOADS = 4
+DOWNLOAD_WORKERS = 4
+
+# Transfer options shared by single-file and batch aria2c invocations
+ARIA2_TRANSFER_OPTIONS = [
+    '--allow-overwrite=true',
+    '--auto-file-renaming=false',
+    f'--max-tries={ARIA2_MAX_TRIES}',
+    f'--retry-wait={ARIA2_RETRY_WAIT}',
+    f'--timeout={ARIA2_TIMEOUT}',
+    f'--min-split-size={ARIA2_MIN_SPLIT_SIZE}',
+    f'--piece-length={ARIA2_MIN_SPLIT_SIZE}',
+    '--file-allocation=falloc',
+    '--continue=true',
+    '--remote-time=true'
+]
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
 
 # Status icons for consistent user feedback
 ICONS = {
@@ -50,53 +98,144 @@ class ValidationError(Exception):
     """Custom exception for validation-related errors"""
     pass
 
+@dataclass
+class DownloadItem:
+    """A single file to fetch as part of a batch download"""
+    url: str
+    output_dir: Path
+    filename: str
+    token: str = ""
+    expected_hash: Optional[str] = None
+
+# Direct constructors for common digests, skipping hashlib.new's name lookup
+_HASHERS = {
+    'sha256': hashlib.sha256,
+    'sha1': hashlib.sha1,
+    'md5': hashlib.md5,
+    'blake2b': hashlib.blake2b
+}
+
+def _new_hasher(hash_algorithm: str):
+    """Create a hash object for an integrity check (not a security context)"""
+    if hash_algorithm == 'blake3':
+        if not BLAKE3_AVAILABLE:
+            raise ValueError("blake3 hashing requested but the blake3 package is not installed")
+        return blake3()
+    constructor = _HASHERS.get(hash_algorithm)
+    if constructor is not None:
+        return constructor(usedforsecurity=False)
+    return hashlib.new(hash_algorithm, usedforsecurity=False)
+
+# Shared HTTP session so repeated downloads reuse pooled keep-alive connections
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """
+    Return the shared HTTP session, creating it on first use
+    Returns: requests.Session with a pooled, retrying adapter
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=ARIA2_MAX_TRIES, backoff_factor=ARIA2_RETRY_WAIT,
+                          status_forcelist=RETRY_STATUS_CODES, raise_on_status=False)
+            adapter = HTTPAdapter(pool_maxsize=ARIA2_CONNECTIONS, max_retries=retry)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # Close the pooled connections once the last thread using this session drops it
+            weakref.finalize(session, adapter.close)
+            _session = session
+        return _session
+
+def reset_session() -> None:
+    """
+    Swap out the shared HTTP session so the next request opens fresh connections
+    The old session is not closed here: other threads may still be streaming on
+    it, and its connections are closed when it is garbage collected
+    """
+    global _session
+    with _session_lock:
+        _session = None
+
+def _handle_http_error(e: requests.RequestException) -> None:
+    """Reset the shared session on connection failures and 5xx, but keep it for throttling"""
+    status = e.response.status_code if e.response is not None else None
+    if isinstance(e, requests.ConnectionError) or (status is not None and status >= 500):
+        reset_session()
+
+@functools.lru_cache(maxsize=1)
 def ensure_aria2() -> bool:
     """
     Ensure aria2c is available on the system
+    The probe runs once per process; call ensure_aria2.cache_clear() to re-check
     Returns: True if aria2c is available, False otherwise
     """
     try:
         result = subprocess.run(['aria2c', '--version'],
                               capture_output=True, text=True, timeout=5)
         if result.returncode == 0:
-            logger.info(f"{ICONS['success']} aria2c is available")
+            logger.info("%s aria2c is available", ICONS['success'])
             return True
         else:
-            logger.error(f"{ICONS['error']} aria2c not working properly")
+            logger.error("%s aria2c not working properly", ICONS['error'])
             return False
     except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError) as e:
-        logger.error(f"{ICONS['error']} aria2c not found or not working: {e}")
+        logger.error("%s aria2c not found or not working: %s", ICONS['error'], e)
         return False
 
-def validate_file_size(file_path: Path, min_size_mb: int = MIN_FILE_SIZE_MB) -> bool:
+def _file_size(file_path: Path) -> Optional[int]:
+    """Return the size of a file with a single stat, or None if it does not exist"""
+    try:
+        return file_path.stat().st_size
+    except FileNotFoundError:
+        return None
+
+def validate_file_size(file_path: Path, min_size_mb: int = MIN_FILE_SIZE_MB,
+                       file_size: Optional[int] = None) -> bool:
     """
     Validate that downloaded file meets minimum size requirements
 
     Args:
         file_path: Path to the file to validate
         min_size_mb: Minimum file size in MB
+        file_size: Size already obtained by the caller, to avoid another stat
 
     Returns:
         True if file is valid, False otherwise
     """
     try:
-        if not file_path.exists():
-            logger.error(f"{ICONS['error']} File does not exist: {file_path}")
+        if file_size is None:
+            file_size = _file_size(file_path)
+        if file_size is None:
+            logger.error("%s File does not exist: %s", ICONS['error'], file_path)
             return False
 
-        file_size = file_path.stat().st_size
         min_size_bytes = min_size_mb * 1024 * 1024
 
         if file_size < min_size_bytes:
-            logger.error(f"{ICONS['error']} File too small: {file_size} bytes (minimum: {min_size_bytes})")
+            logger.error("%s File too small: %d bytes (minimum: %d)", ICONS['error'], file_size, min_size_bytes)
             return False
 
-        logger.info(f"{ICONS['success']} File size validation passed: {file_size:,} bytes")
+        logger.info("%s File size validation passed: %d bytes", ICONS['success'], file_size)
         return True
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error validating file size: {e}")
+        logger.error("%s Error validating file size: %s", ICONS['error'], e)
         return False
 
+# Source name, display name and URL pattern per host
+_SOURCES = {
+    **{host: ('huggingface', 'HuggingFace', _HUGGINGFACE_URL_RE) for host in HUGGINGFACE_HOSTS},
+    CIVITAI_HOST: ('civitai', 'CivitAI', _CIVITAI_URL_RE),
+}
+
+def _url_source(url: str) -> Optional[Tuple[str, str, re.Pattern]]:
+    """Look up the known download source for a URL's host, if any"""
+    host = _URL_HOST_RE.match(url)
+    # Host names are case-insensitive
+    return _SOURCES.get(host.group(1).lower()) if host else None
+
 def validate_huggingface_url(url: str) -> bool:
     """
     Validate HuggingFace model URL format
@@ -108,22 +247,12 @@ def validate_huggingface_url(url: str) -> bool:
         True if URL is valid HuggingFace format, False otherwise
     """
     try:
-        parsed = urlparse(url)
-        if parsed.netloc not in ['huggingface.co', 'hf.co']:
+        if not _HUGGINGFACE_URL_RE.match(url):
             return False
-
-        # Check for proper path format: /user/model/resolve/main/filename
-        path_parts = parsed.path.strip('/').split('/')
-        if len(path_parts) < 5:
-            return False
-
-        if 'resolve' not in path_parts:
-            return False
-
-        logger.info(f"{ICONS['success']} Valid HuggingFace URL format")
+        logger.debug("%s Valid HuggingFace URL format", ICONS['success'])
         return True
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error validating HuggingFace URL: {e}")
+        logger.error("%s Error validating HuggingFace URL: %s", ICONS['error'], e)
         return False
 
 def validate_civitai_url(url: str) -> bool:
@@ -137,19 +266,12 @@ def validate_civitai_url(url: str) -> bool:
         True if URL is valid CivitAI format, False otherwise
     """
     try:
-        parsed = urlparse(url)
-        if parsed.netloc != 'civitai.com':
-            return False
-
-        # Check for model ID in query parameters
-        query_params = parse_qs(parsed.query)
-        if 'modelVersionId' not in query_params and 'id' not in query_params:
+        if not _CIVITAI_URL_RE.match(url):
             return False
-
-        logger.info(f"{ICONS['success']} Valid CivitAI URL format")
+        logger.debug("%s Valid CivitAI URL format", ICONS['success'])
         return True
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error validating CivitAI URL: {e}")
+        logger.error("%s Error validating CivitAI URL: %s", ICONS['error'], e)
         return False
 
 def cleanup_existing_file(file_path: Path) -> bool:
@@ -165,13 +287,28 @@ def cleanup_existing_file(file_path: Path) -> bool:
     try:
         if file_path.exists():
             file_path.unlink()
-            logger.info(f"{ICONS['processing']} Removed existing file: {file_path}")
+            logger.info("%s Removed existing file: %s", ICONS['processing'], file_path)
         return True
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error removing existing file: {e}")
+        logger.error("%s Error removing existing file: %s", ICONS['error'], e)
         return False
 
-def build_aria2_command(url: str, output_dir: Path, filename: str, token: str = "") -> list:
+def validate_source_url(url: str) -> None:
+    """
+    Validate URL format based on source
+
+    Args:
+        url: URL to validate
+
+    Raises:
+        ValidationError: If the URL does not match its source's format
+    """
+    source = _url_source(url)
+    if source and not source[2].match(url):
+        raise ValidationError(f"Invalid {source[1]} URL format: {url}")
+
+def build_aria2_command(url: str, output_dir: Path, filename: str, token: str = "",
+                        connections: int = ARIA2_CONNECTIONS) -> list:
     """
     Build aria2c command with optimized parameters
 
@@ -180,6 +317,7 @@ def build_aria2_command(url: str, output_dir: Path, filename: str, token: str =
         output_dir: Directory to save file
         filename: Name of output file
         token: Optional authentication token
+        connections: Connections (and splits) to use for this file
 
     Returns:
         List of command arguments
@@ -190,16 +328,9 @@ def build_aria2_command(url: str, output_dir: Path, filename: str, token: str =
         '--summary-interval=0',
         f'--dir={output_dir}',
         f'--out={filename}',
-        '--allow-overwrite=true',
-        '--auto-file-renaming=false',
-        f'--max-connection-per-server={ARIA2_CONNECTIONS}',
-        f'--split={ARIA2_SPLITS}',
-        f'--max-tries={ARIA2_MAX_TRIES}',
-        f'--retry-wait={ARIA2_RETRY_WAIT}',
-        f'--timeout={ARIA2_TIMEOUT}',
-        f'--min-split-size={ARIA2_MIN_SPLIT_SIZE}',
-        '--continue=true',
-        '--remote-time=true'
+        f'--max-connection-per-server={connections}',
+        f'--split={connections}',
+        *ARIA2_TRANSFER_OPTIONS
     ]
 
     # Add authentication header if token provided
@@ -211,7 +342,46 @@ def build_aria2_command(url: str, output_dir: Path, filename: str, token: str =
 
     return cmd
 
-def download_with_aria2(url: str, output_dir: Path, filename: str, token: str = "") -> bool:
+def run_aria2(cmd: list, timeout: int = DOWNLOAD_TIMEOUT) -> Tuple[int, str]:
+    """
+    Run aria2c, streaming its stderr through a reader thread that keeps only the last lines
+
+    Args:
+        cmd: aria2c command arguments
+        timeout: Seconds to wait before killing aria2c
+
+    Returns:
+        Tuple of (exit code, tail of stderr)
+
+    Raises:
+        subprocess.TimeoutExpired: If aria2c runs longer than timeout
+    """
+    tail = deque(maxlen=ARIA2_STDERR_TAIL_LINES)
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, bufsize=1)
+
+    def drain_stderr() -> None:
+        for line in proc.stderr:
+            line = line.rstrip()
+            if line:
+                logger.debug("aria2c: %s", line)
+                tail.append(line)
+
+    reader = threading.Thread(target=drain_stderr, daemon=True)
+    reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        reader.join(timeout=5)
+        proc.stderr.close()
+    return returncode, "\n".join(tail)
+
+def download_with_aria2(url: str, output_dir: Path, filename: str, token: str = "",
+                        connections: int = ARIA2_CONNECTIONS, skip_preflight: bool = False) -> bool:
     """
     Download file using aria2c with robust error handling
 
@@ -220,22 +390,19 @@ def download_with_aria2(url: str, output_dir: Path, filename: str, token: str =
         output_dir: Directory to save file
         filename: Name of output file
         token: Optional authentication token
+        connections: Connections (and splits) to use for this file
+        skip_preflight: Skip the aria2c probe and URL validation (caller already did them)
 
     Returns:
         True if download successful, False otherwise
     """
     try:
         # Pre-flight checks
-        if not ensure_aria2():
-            raise DownloadError("aria2c not available")
+        if not skip_preflight:
+            if not ensure_aria2():
+                raise DownloadError("aria2c not available")
 
-        # Validate URL format based on source
-        if 'huggingface.co' in url or 'hf.co' in url:
-            if not validate_huggingface_url(url):
-                raise ValidationError(f"Invalid HuggingFace URL format: {url}")
-        elif 'civitai.com' in url:
-            if not validate_civitai_url(url):
-                raise ValidationError(f"Invalid CivitAI URL format: {url}")
+            validate_source_url(url)
 
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -246,42 +413,232 @@ def download_with_aria2(url: str, output_dir: Path, filename: str, token: str =
             raise DownloadError("Failed to cleanup existing file")
 
         # Build and execute download command
-        cmd = build_aria2_command(url, output_dir, filename, token)
+        cmd = build_aria2_command(url, output_dir, filename, token, connections)
 
-        logger.info(f"{ICONS['download']} Starting download: {filename}")
-        logger.info(f"{ICONS['info']} URL: {url}")
-        logger.info(f"{ICONS['info']} Output: {file_path}")
+        logger.info("%s Starting download: %s", ICONS['download'], filename)
+        logger.info("%s URL: %s", ICONS['info'], url)
+        logger.info("%s Output: %s", ICONS['info'], file_path)
 
         # Execute download with timeout
         start_time = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)  # 1 hour timeout
+        returncode, stderr_tail = run_aria2(cmd)
         end_time = time.time()
 
-        if result.returncode != 0:
-            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-            raise DownloadError(f"aria2c failed with code {result.returncode}: {error_msg}")
+        if returncode != 0:
+            error_msg = stderr_tail or "Unknown error"
+            raise DownloadError(f"aria2c failed with code {returncode}: {error_msg}")
 
         # Validate downloaded file
-        if not validate_file_size(file_path):
+        file_size = _file_size(file_path)
+        if not validate_file_size(file_path, file_size=file_size):
             raise ValidationError("Downloaded file failed size validation")
 
         duration = end_time - start_time
-        file_size = file_path.stat().st_size
         speed_mbps = (file_size / (1024 * 1024)) / duration
 
-        logger.info(f"{ICONS['success']} Download completed successfully")
-        logger.info(f"{ICONS['info']} Time: {duration:.1f}s, Size: {file_size:,} bytes, Speed: {speed_mbps:.1f} MB/s")
+        logger.info("%s Download completed successfully", ICONS['success'])
+        logger.info("%s Time: %.1fs, Size: %d bytes, Speed: %.1f MB/s", ICONS['info'], duration, file_size, speed_mbps)
 
         return True
 
     except subprocess.TimeoutExpired:
-        logger.error(f"{ICONS['error']} Download timeout after 1 hour")
+        logger.error("%s Download timeout after 1 hour", ICONS['error'])
         return False
     except (DownloadError, ValidationError) as e:
-        logger.error(f"{ICONS['error']} {e}")
+        logger.error("%s %s", ICONS['error'], e)
         return False
     except Exception as e:
-        logger.error(f"{ICONS['error']} Unexpected error during download: {e}")
+        logger.error("%s Unexpected error during download: %s", ICONS['error'], e)
+        return False
+
+def download_with_session(url: str, output_dir: Path, filename: str, token: str = "",
+                          hash_algorithm: str = 'sha256', skip_preflight: bool = False) -> Optional[str]:
+    """
+    Download file over the shared HTTP session, hashing each block as it is written
+
+    Args:
+        url: URL to download
+        output_dir: Directory to save file
+        filename: Name of output file
+        token: Optional authentication token
+        hash_algorithm: Hash algorithm to use
+        skip_preflight: Skip URL validation (caller already did it)
+
+    Returns:
+        Hex digest of the downloaded file, or None if the download failed
+    """
+    try:
+        if not skip_preflight:
+            validate_source_url(url)
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_path = output_dir / filename
+
+        if not cleanup_existing_file(file_path):
+            raise DownloadError("Failed to cleanup existing file")
+
+        headers = {'Authorization': f'Bearer {token}'} if token else None
+        hash_obj = _new_hasher(hash_algorithm)
+
+        logger.info("%s Starting session download: %s", ICONS['download'], filename)
+        logger.info("%s URL: %s", ICONS['info'], url)
+        logger.info("%s Output: %s", ICONS['info'], file_path)
+
+        start_time = time.time()
+        with get_session().get(url, headers=headers, stream=True,
+                               timeout=(ARIA2_TIMEOUT, ARIA2_TIMEOUT)) as response:
+            response.raise_for_status()
+            with open(file_path, 'wb') as f:
+                # Reserve the whole file up front so it gets contiguous extents
+                content_length = response.headers.get('Content-Length', '')
+                if content_length.isdigit() and hasattr(os, 'posix_fallocate'):
+                    os.posix_fallocate(f.fileno(), 0, int(content_length))
+                for block in response.iter_content(chunk_size=HASH_BUFFER_SIZE):
+                    hash_obj.update(block)
+                    f.write(block)
+                    if time.time() - start_time > DOWNLOAD_TIMEOUT:
+                        raise DownloadError("Download timeout after 1 hour")
+                # Drop any reserved tail if the body was shorter than advertised
+                f.truncate()
+        duration = time.time() - start_time
+
+        file_size = _file_size(file_path)
+        if not validate_file_size(file_path, file_size=file_size):
+            raise ValidationError("Downloaded file failed size validation")
+
+        speed_mbps = (file_size / (1024 * 1024)) / duration
+
+        logger.info("%s Download completed successfully", ICONS['success'])
+        logger.info("%s Time: %.1fs, Size: %d bytes, Speed: %.1f MB/s", ICONS['info'], duration, file_size, speed_mbps)
+
+        return hash_obj.hexdigest()
+
+    except requests.RequestException as e:
+        _handle_http_error(e)
+        logger.error("%s HTTP error during download: %s", ICONS['error'], e)
+        return None
+    except (DownloadError, ValidationError) as e:
+        logger.error("%s %s", ICONS['error'], e)
+        return None
+    except Exception as e:
+        logger.error("%s Unexpected error during download: %s", ICONS['error'], e)
+        return None
+
+def probe_remote_file(url: str, token: str = "") -> Tuple[Optional[int], bool, str]:
+    """
+    Inspect a remote file with a HEAD request on the shared session
+
+    Args:
+        url: URL to inspect
+        token: Optional authentication token
+
+    Returns:
+        Tuple of (size in bytes or None, whether byte ranges are supported, final URL after redirects)
+    """
+    headers = {'Authorization': f'Bearer {token}'} if token else None
+    try:
+        response = get_session().head(url, headers=headers, allow_redirects=True,
+                                      timeout=(ARIA2_TIMEOUT, ARIA2_TIMEOUT))
+        response.raise_for_status()
+        content_length = response.headers.get('Content-Length')
+        accept_ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        return (int(content_length) if content_length else None), accept_ranges, response.url
+    except requests.RequestException as e:
+        _handle_http_error(e)
+        logger.warning("%s Could not inspect remote file: %s", ICONS['warning'], e)
+        return None, False, url
+    except ValueError as e:
+        logger.warning("%s Invalid Content-Length from server: %s", ICONS['warning'], e)
+        return None, False, url
+
+def parallel_range_download(url: str, output_dir: Path, filename: str, size: int, token: str = "",
+                            connections: int = ARIA2_CONNECTIONS) -> bool:
+    """
+    Download file as concurrent HTTP range requests written in place with os.pwrite
+
+    Args:
+        url: URL to download (ideally already resolved past redirects)
+        output_dir: Directory to save file
+        filename: Name of output file
+        size: Total size of the remote file in bytes
+        token: Optional authentication token
+        connections: Number of concurrent range requests
+
+    Returns:
+        True if download successful, False otherwise
+    """
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        file_path = output_dir / filename
+
+        if not cleanup_existing_file(file_path):
+            raise DownloadError("Failed to cleanup existing file")
+
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        session = get_session()
+        part_size = max(-(-size // connections), 1)
+        ranges = [(lo, min(lo + part_size, size) - 1) for lo in range(0, size, part_size)]
+        failed = threading.Event()
+
+        def fetch_range(fd: int, lo: int, hi: int) -> None:
+            with session.get(url, headers={**headers, 'Range': f'bytes={lo}-{hi}'}, stream=True,
+                             timeout=(ARIA2_TIMEOUT, ARIA2_TIMEOUT)) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise DownloadError(f"Server ignored range request (HTTP {response.status_code})")
+                offset = lo
+                for block in response.iter_content(chunk_size=HASH_BUFFER_SIZE):
+                    if failed.is_set():
+                        return
+                    view = memoryview(block)
+                    while view:
+                        written = os.pwrite(fd, view, offset)
+                        view = view[written:]
+                        offset += written
+                if offset != hi + 1:
+                    raise DownloadError(f"Incomplete range {lo}-{hi}: got {offset - lo} bytes")
+
+        logger.info("%s Starting parallel download: %s (%d ranges)", ICONS['download'], filename, len(ranges))
+        logger.info("%s URL: %s", ICONS['info'], url)
+        logger.info("%s Output: %s", ICONS['info'], file_path)
+
+        start_time = time.time()
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, size)
+            with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                futures = [pool.submit(fetch_range, fd, lo, hi) for lo, hi in ranges]
+                try:
+                    for future in futures:
+                        future.result(timeout=DOWNLOAD_TIMEOUT)
+                except BaseException:
+                    failed.set()
+                    raise
+        finally:
+            os.close(fd)
+        duration = time.time() - start_time
+
+        file_size = _file_size(file_path)
+        if not validate_file_size(file_path, file_size=file_size):
+            raise ValidationError("Downloaded file failed size validation")
+
+        speed_mbps = (file_size / (1024 * 1024)) / duration
+
+        logger.info("%s Download completed successfully", ICONS['success'])
+        logger.info("%s Time: %.1fs, Size: %d bytes, Speed: %.1f MB/s", ICONS['info'], duration, file_size, speed_mbps)
+
+        return True
+
+    except requests.RequestException as e:
+        _handle_http_error(e)
+        logger.error("%s HTTP error during download: %s", ICONS['error'], e)
+        return False
+    except (DownloadError, ValidationError) as e:
+        logger.error("%s %s", ICONS['error'], e)
+        return False
+    except Exception as e:
+        logger.error("%s Unexpected error during download: %s", ICONS['error'], e)
         return False
 
 def verify_download_integrity(file_path: Path, expected_hash: str = None, hash_algorithm: str = 'sha256') -> bool:
@@ -298,39 +655,123 @@ def verify_download_integrity(file_path: Path, expected_hash: str = None, hash_a
     """
     try:
         if not expected_hash:
-            logger.info(f"{ICONS['warning']} No hash provided, skipping integrity check")
+            logger.info("%s No hash provided, skipping integrity check", ICONS['warning'])
             return True
 
         if not file_path.exists():
-            logger.error(f"{ICONS['error']} File not found for integrity check: {file_path}")
+            logger.error("%s File not found for integrity check: %s", ICONS['error'], file_path)
             return False
 
-        # Calculate file hash
-        hash_obj = hashlib.new(hash_algorithm)
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hash_obj.update(chunk)
+        if hash_algorithm == 'blake3' and BLAKE3_AVAILABLE:
+            # BLAKE3 hashes the mapped file with SIMD across all cores, no Python loop
+            hash_obj = blake3(max_threads=blake3.AUTO)
+            hash_obj.update_mmap(str(file_path))
+            return _compare_digest(hash_obj.hexdigest(), expected_hash)
+
+        # Calculate file hash: unbuffered 1 MiB readinto straight into a reused
+        # buffer (hashlib.file_digest is fixed at 256 KiB reads)
+        with open(file_path, 'rb', buffering=0) as f:
+            fd = f.fileno()
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            hash_obj = _new_hasher(hash_algorithm)
+            buf = bytearray(HASH_BUFFER_SIZE)
+            view = memoryview(buf)
+            while (n := f.readinto(buf)):
+                hash_obj.update(view[:n])
+            # Release the hashed pages so they don't evict loaded model weights
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+        return _compare_digest(hash_obj.hexdigest(), expected_hash)
 
-        actual_hash = hash_obj.hexdigest()
+    except Exception as e:
+        logger.error("%s Error during integrity check: %s", ICONS['error'], e)
+        return False
 
-        if actual_hash.lower() == expected_hash.lower():
-            logger.info(f"{ICONS['success']} Integrity check passed")
-            return True
-        else:
-            logger.error(f"{ICONS['error']} Integrity check failed")
-            logger.error(f"Expected: {expected_hash}")
-            logger.error(f"Actual:   {actual_hash}")
-            return False
+def _compare_digest(actual_hash: str, expected_hash: str) -> bool:
+    """Compare a computed digest with the expected one in constant time, logging the outcome"""
+    if hmac.compare_digest(actual_hash, expected_hash.lower()):
+        logger.info("%s Integrity check passed", ICONS['success'])
+        return True
+
+    logger.error("%s Integrity check failed", ICONS['error'])
+    logger.error("Expected: %s", expected_hash)
+    logger.error("Actual:   %s", actual_hash)
+    return False
 
+def _load_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Load the URL -> downloaded file manifest for a directory"""
+    try:
+        with open(output_dir / MANIFEST_FILENAME, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("%s Ignoring unreadable download manifest: %s", ICONS['warning'], e)
+        return {}
+
+def _record_download(output_dir: Path, url: str, filename: str, file_hash: Optional[str]) -> None:
+    """Record a completed download in the manifest (atomic tmp + rename)"""
+    try:
+        st = (output_dir / filename).stat()
+        with _manifest_lock:
+            manifest = _load_manifest(output_dir)
+            manifest[hashlib.sha256(url.encode()).hexdigest()] = {
+                'path': filename,
+                'size': st.st_size,
+                'hash': file_hash,
+                'mtime': st.st_mtime_ns
+            }
+            temp_manifest = output_dir / f"{MANIFEST_FILENAME}.{os.getpid()}.tmp"
+            with open(temp_manifest, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_manifest, output_dir / MANIFEST_FILENAME)
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error during integrity check: {e}")
+        logger.warning("%s Failed to update download manifest: %s", ICONS['warning'], e)
+
+def _is_already_downloaded(output_dir: Path, url: str, filename: str, expected_hash: Optional[str]) -> bool:
+    """Check whether a previous download of url is still intact at output_dir/filename"""
+    entry = _load_manifest(output_dir).get(hashlib.sha256(url.encode()).hexdigest())
+    if not entry or entry.get('path') != filename:
+        return False
+
+    try:
+        st = (output_dir / filename).stat()
+    except OSError:
+        return False
+    if st.st_size != entry.get('size') or st.st_mtime_ns != entry.get('mtime'):
+        return False
+
+    if not expected_hash:
+        return True
+    if entry.get('hash'):
+        return hmac.compare_digest(entry['hash'], expected_hash.lower())
+
+    # First verified request for an unhashed file: hash it once and remember the result
+    if not verify_download_integrity(output_dir / filename, expected_hash):
         return False
+    _record_download(output_dir, url, filename, expected_hash.lower())
+    return True
+
+def _partial_path(final_file: Path) -> Path:
+    """Return the in-progress path used while downloading final_file"""
+    return final_file.with_name(f"{final_file.name}.{os.getpid()}.part")
+
+def _remove_partial(temp_file: Path) -> None:
+    """Remove an unfinished download and any aria2c control file left beside it"""
+    for path in (temp_file, temp_file.with_name(temp_file.name + '.aria2')):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("%s Failed to remove partial download %s: %s", ICONS['warning'], path, e)
 
 def atomic_download(url: str, output_dir: Path, filename: str, token: str = "",
-                   expected_hash: str = None) -> bool:
+                   expected_hash: str = None, connections: int = ARIA2_CONNECTIONS) -> bool:
     """
     Perform atomic download with validation and cleanup
     Download → Verify → Move → Cleanup pattern
+    Skips the download when the manifest shows the file is already in place
 
     Args:
         url: URL to download
@@ -338,47 +779,189 @@ def atomic_download(url: str, output_dir: Path, filename: str, token: str = "",
         filename: Final filename
         token: Optional authentication token
         expected_hash: Optional hash for integrity checking
+        connections: Connections to open for a split download of this file
 
     Returns:
         True if atomic download successful, False otherwise
     """
-    temp_dir = None
+    temp_file = None
     try:
-        # Create temporary directory for download
-        temp_dir = Path(tempfile.mkdtemp(prefix='pllm_download_'))
-        temp_file = temp_dir / filename
-        final_file = output_dir / filename
+        if _is_already_downloaded(output_dir, url, filename, expected_hash):
+            logger.info("%s Already downloaded, skipping: %s", ICONS['success'], output_dir / filename)
+            return True
 
-        logger.info(f"{ICONS['processing']} Starting atomic download: {filename}")
+        # Validate once here; the downloaders below skip their own preflight
+        validate_source_url(url)
 
-        # Download to temporary location
-        if not download_with_aria2(url, temp_dir, filename, token):
+        # Download to a .part file beside the destination so the final move is a rename
+        output_dir.mkdir(parents=True, exist_ok=True)
+        final_file = output_dir / filename
+        temp_file = _partial_path(final_file)
+
+        logger.info("%s Starting atomic download: %s", ICONS['processing'], filename)
+
+        # Smaller files reuse the pooled session and are hashed while streaming, so
+        # verification needs no second pass; larger ones are split into parallel
+        # ranges and verified afterwards. aria2c only handles servers that refuse ranges
+        remote_size, accept_ranges, resolved_url = probe_remote_file(url, token)
+        small_file = remote_size is not None and remote_size < SESSION_MAX_FILE_SIZE_MB * 1024 * 1024
+        file_hash = None
+        if small_file or (expected_hash and remote_size is None):
+            file_hash = download_with_session(url, output_dir, temp_file.name, token, skip_preflight=True)
+            ok = file_hash is not None
+        elif remote_size is not None and accept_ranges:
+            # Resolved CDN URLs are pre-signed; only send the token back to the origin host
+            same_host = urlparse(resolved_url).netloc == urlparse(url).netloc
+            ok = parallel_range_download(resolved_url, output_dir, temp_file.name, remote_size,
+                                         token if same_host else "", connections)
+        else:
+            if not ensure_aria2():
+                raise DownloadError("aria2c not available")
+            ok = download_with_aria2(url, output_dir, temp_file.name, token, connections,
+                                     skip_preflight=True)
+        if not ok:
             raise DownloadError("Download failed")
 
-        # Verify integrity if hash provided
-        if expected_hash and not verify_download_integrity(temp_file, expected_hash):
-            raise ValidationError("Integrity verification failed")
+        if expected_hash:
+            if file_hash is not None:
+                verified = _compare_digest(file_hash, expected_hash)
+            else:
+                verified = verify_download_integrity(temp_file, expected_hash)
+            if not verified:
+                raise ValidationError("Integrity verification failed")
+            file_hash = expected_hash.lower()
 
-        # Ensure final output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Atomic rename to final location (same filesystem, no copy)
+        os.replace(temp_file, final_file)
+        _record_download(output_dir, url, filename, file_hash)
 
-        # Atomic move to final location
-        shutil.move(str(temp_file), str(final_file))
-
-        logger.info(f"{ICONS['complete']} Atomic download completed: {final_file}")
+        logger.info("%s Atomic download completed: %s", ICONS['complete'], final_file)
         return True
 
     except Exception as e:
-        logger.error(f"{ICONS['error']} Atomic download failed: {e}")
+        logger.error("%s Atomic download failed: %s", ICONS['error'], e)
+        if temp_file:
+            _remove_partial(temp_file)
         return False
-    finally:
-        # Cleanup temporary directory
-        if temp_dir and temp_dir.exists():
+
+def atomic_download_many(items: List[DownloadItem], max_workers: int = DOWNLOAD_WORKERS) -> List[bool]:
+    """
+    Run atomic_download for several files concurrently on a thread pool
+    Connection counts are divided between workers so the total per server stays at ARIA2_CONNECTIONS
+
+    Args:
+        items: Files to download
+        max_workers: Maximum number of files downloading at once
+
+    Returns:
+        List of per-item success flags, in the same order as items
+    """
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    connections = max(1, ARIA2_CONNECTIONS // workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pllm_download') as pool:
+        futures = [pool.submit(atomic_download, item.url, item.output_dir, item.filename,
+                               item.token, item.expected_hash, connections) for item in items]
+        return [future.result() for future in futures]
+
+def batch_atomic_download(items: List[DownloadItem]) -> List[bool]:
+    """
+    Download several files with a single aria2c process sharing one connection pool
+    Each file is staged, verified and renamed into place like atomic_download
+
+    Args:
+        items: Files to download
+
+    Returns:
+        List of per-item success flags, in the same order as items
+    """
+    results = [False] * len(items)
+    if not items:
+        return results
+
+    if not ensure_aria2():
+        logger.warning("%s aria2c not available, downloading files one by one", ICONS['warning'])
+        return [atomic_download(item.url, item.output_dir, item.filename, item.token,
+                                item.expected_hash) for item in items]
+
+    pending = {}
+    input_path = None
+    try:
+        for i, item in enumerate(items):
             try:
-                shutil.rmtree(temp_dir)
-                logger.info(f"{ICONS['processing']} Cleaned up temporary directory")
+                if _is_already_downloaded(item.output_dir, item.url, item.filename, item.expected_hash):
+                    logger.info("%s Already downloaded, skipping: %s", ICONS['success'], item.output_dir / item.filename)
+                    results[i] = True
+                    continue
+                validate_source_url(item.url)
+                item.output_dir.mkdir(parents=True, exist_ok=True)
+                pending[i] = _partial_path(item.output_dir / item.filename)
             except Exception as e:
-                logger.warning(f"{ICONS['warning']} Failed to cleanup temp directory: {e}")
+                logger.error("%s Skipping %s: %s", ICONS['error'], item.url, e)
+
+        if not pending:
+            return results
+
+        # aria2c input file: one URL per entry followed by indented per-download options
+        with tempfile.NamedTemporaryFile('w', prefix='pllm_aria2_', suffix='.txt', delete=False) as f:
+            input_path = Path(f.name)
+            for i, temp_file in pending.items():
+                item = items[i]
+                f.write(f"{item.url}\n  dir={item.output_dir}\n  out={temp_file.name}\n")
+                if item.token:
+                    f.write(f"  header=Authorization: Bearer {item.token}\n")
+
+        cmd = [
+            'aria2c',
+            '--console-log-level=warn',
+            '--summary-interval=0',
+            f'--input-file={input_path}',
+            '--deferred-input=true',
+            f'--max-concurrent-downloads={ARIA2_MAX_CONCURRENT_DOWNLOADS}',
+            f'--max-connection-per-server={ARIA2_CONNECTIONS}',
+            f'--split={ARIA2_SPLITS}',
+            *ARIA2_TRANSFER_OPTIONS
+        ]
+
+        logger.info("%s Starting batch download of %d files", ICONS['download'], len(pending))
+        returncode, stderr_tail = run_aria2(cmd)
+        if returncode != 0:
+            logger.warning("%s aria2c reported failures (code %d): %s", ICONS['warning'], returncode, stderr_tail)
+
+        for i, temp_file in pending.items():
+            item = items[i]
+            try:
+                # aria2c keeps a .aria2 control file beside any download it did not finish
+                if temp_file.with_name(temp_file.name + '.aria2').exists():
+                    raise DownloadError("Download incomplete")
+                if not validate_file_size(temp_file):
+                    raise ValidationError("Downloaded file failed size validation")
+                if item.expected_hash and not verify_download_integrity(temp_file, item.expected_hash):
+                    raise ValidationError("Integrity verification failed")
+                os.replace(temp_file, item.output_dir / item.filename)
+                _record_download(item.output_dir, item.url, item.filename,
+                                 item.expected_hash.lower() if item.expected_hash else None)
+                results[i] = True
+            except Exception as e:
+                logger.error("%s Batch download failed for %s: %s", ICONS['error'], item.filename, e)
+
+        logger.info("%s Batch download finished: %d/%d files ready", ICONS['complete'], sum(results), len(items))
+        return results
+
+    except subprocess.TimeoutExpired:
+        logger.error("%s Batch download timeout after 1 hour", ICONS['error'])
+        return results
+    except Exception as e:
+        logger.error("%s Batch download failed: %s", ICONS['error'], e)
+        return results
+    finally:
+        if input_path:
+            input_path.unlink(missing_ok=True)
+        for i, temp_file in pending.items():
+            if not results[i]:
+                _remove_partial(temp_file)
 
 def get_download_info(url: str) -> Dict[str, Any]:
     """
@@ -406,23 +989,23 @@ def get_download_info(url: str) -> Dict[str, Any]:
             info['filename'] = path_parts[-1]
 
         # Validate based on domain
-        if parsed.netloc in ['huggingface.co', 'hf.co']:
-            info['valid'] = validate_huggingface_url(url)
-            info['source'] = 'huggingface'
-        elif parsed.netloc == 'civitai.com':
-            info['valid'] = validate_civitai_url(url)
-            info['source'] = 'civitai'
+        source = _SOURCES.get(parsed.hostname or '')
+        if source:
+            info['source'] = source[0]
+            info['valid'] = source[2].match(url) is not None
         else:
             info['source'] = 'unknown'
 
         return info
 
     except Exception as e:
-        logger.error(f"{ICONS['error']} Error getting download info: {e}")
+        logger.error("%s Error getting download info: %s", ICONS['error'], e)
         return {'url': url, 'valid': False, 'error': str(e)}
 
 if __name__ == "__main__":
     """Command line interface for testing download utilities"""
+    logging.basicConfig(level=logging.INFO)
+
     if len(sys.argv) < 4:
         print(f"Usage: {sys.argv[0]} <url> <output_dir> <filename> [token]")
         sys.exit(1)
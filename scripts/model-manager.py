@@ -9,21 +9,44 @@ import json
 import math
 import asyncio
 import logging
+import logging.handlers
+import queue
+import atexit
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import hashlib
 import shutil
+import tempfile
+import mmap
+import struct
+import ctypes
+import ctypes.util
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
+import numpy as np
 import requests
-from huggingface_hub import HfApi, model_info, snapshot_download
-from transformers import AutoConfig, AutoTokenizer
-import torch
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from blake3 import blake3
+    CHECKSUM_ALGORITHM = "blake3"
+except ImportError:
+    CHECKSUM_ALGORITHM = "sha256"
+
 # Import our robust download utilities
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -33,6 +56,9 @@ try:
         atomic_download,
         get_download_info,
         ensure_aria2,
+        run_aria2,
+        probe_remote_file,
+        ARIA2_TRANSFER_OPTIONS,
         DownloadError,
         ValidationError,
         ICONS
@@ -44,6 +70,152 @@ except ImportError as e:
     ICONS = {'success': '✅', 'error': '❌', 'warning': '⚠️', 'download': '📥'}
 
 
+# Parallel file downloads for snapshot_download and the aria2c backend
+SNAPSHOT_MAX_WORKERS = 8
+ARIA2_REPO_CONNECTIONS = 16
+
+CHECKSUM_BUFFER_SIZE = 1024 * 1024
+CHECKSUM_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Encrypted model files: magic + plaintext size, then per chunk nonce + ciphertext
+ENCRYPTED_MODEL_MAGIC = b"PLLMM\x01"
+ENCRYPTED_MODEL_SUFFIX = ".enc"
+ENCRYPTION_CHUNK_SIZE = 16 * 1024 * 1024
+GCM_NONCE_SIZE = 12
+
+# fallocate(2) flags for discarding file blocks on secure delete
+FALLOC_FL_KEEP_SIZE = 0x01
+FALLOC_FL_PUNCH_HOLE = 0x02
+SECURE_DELETE_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Seconds a free-space reading is reused by get_system_status
+DISK_USAGE_TTL = 1.0
+
+# Seconds a model id that HuggingFace reported as missing is refused without a network call
+MISSING_MODEL_TTL = 3600.0
+
+
+class ModelNotFoundError(Exception):
+    """Model id does not exist on HuggingFace (or is not accessible with the token)"""
+    pass
+
+
+def _is_repository_not_found(error: BaseException) -> bool:
+    """Whether error, or an exception it was raised from, is a HuggingFace 404 for the repository"""
+    try:
+        from huggingface_hub.utils import RepositoryNotFoundError
+    except ImportError:
+        return False
+
+    # transformers wraps the hub error in an OSError
+    while error is not None:
+        if isinstance(error, RepositoryNotFoundError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _json_default(obj):
+    """Match orjson's output for enums when falling back to stdlib json"""
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _new_checksum_hasher():
+    """Hasher for CHECKSUM_ALGORITHM (BLAKE3 when installed, else SHA-256)"""
+    if CHECKSUM_ALGORITHM == "blake3":
+        return blake3(max_threads=blake3.AUTO)
+    return hashlib.sha256()
+
+
+def _hash_file(file_path: Path) -> str:
+    """Digest of a single file, with the read loop running outside Python"""
+    if CHECKSUM_ALGORITHM == "blake3":
+        # Memory-mapped, SIMD and multi-threaded inside the blake3 extension
+        hasher = _new_checksum_hasher()
+        hasher.update_mmap(str(file_path))
+        return hasher.hexdigest()
+
+    with open(file_path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        hasher = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHECKSUM_BUFFER_SIZE), b""):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+
+def _scan_files(root: Path) -> List[Tuple[str, str, int]]:
+    """(relative posix path, absolute path, size) for every file under root, following symlinks"""
+    files = []
+    pending = [(str(root), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel = prefix + entry.name
+                if entry.is_dir():
+                    pending.append((entry.path, rel + "/"))
+                elif entry.is_file():
+                    files.append((rel, entry.path, entry.stat().st_size))
+    files.sort()
+    return files
+
+
+def _combine_digests(relpaths: List[str], digests: List[str]) -> str:
+    """Model checksum as <algorithm>:<hex> from per-file digests in path order"""
+    hasher = _new_checksum_hasher()
+    for rel, digest in zip(relpaths, digests):
+        hasher.update(f"{rel}\0{digest}\n".encode())
+
+    # Untagged checksums from older databases are plain SHA-256
+    return f"{CHECKSUM_ALGORITHM}:{hasher.hexdigest()}"
+
+
+def _load_fallocate():
+    """libc fallocate(2), or None where it is unavailable (non-Linux, musl quirks)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fallocate = libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+_fallocate = _load_fallocate()
+
+
+def _punch_hole(fd: int, size: int) -> bool:
+    """Deallocate a file's blocks so the filesystem can discard them to the device"""
+    if _fallocate is None:
+        return False
+    return _fallocate(fd, FALLOC_FL_PUNCH_HOLE | FALLOC_FL_KEEP_SIZE, 0, size) == 0
+
+
+def _overwrite_random(fd: int, size: int):
+    """Single pass of random data over the file, copied kernel-side where possible"""
+    os.lseek(fd, 0, os.SEEK_SET)
+    offset = 0
+    urandom_fd = os.open("/dev/urandom", os.O_RDONLY)
+    try:
+        while offset < size:
+            sent = os.sendfile(fd, urandom_fd, None, min(SECURE_DELETE_CHUNK_SIZE, size - offset))
+            if sent <= 0:
+                break
+            offset += sent
+    except OSError:
+        # Older kernels cannot splice from /dev/urandom
+        pass
+    finally:
+        os.close(urandom_fd)
+
+    while offset < size:
+        offset += os.write(fd, os.urandom(min(SECURE_DELETE_CHUNK_SIZE, size - offset)))
+
+
 class ModelFormat(Enum):
     GGUF = "gguf"
     GPTQ = "gptq"
@@ -54,6 +226,14 @@ class ModelFormat(Enum):
 
 
 class Quantization(Enum):
+    # Values stay strings (persisted and used on the CLI); each member also
+    # gets a stable ordinal for indexing the per-quantization lookup arrays
+    def __new__(cls, value: str):
+        obj = object.__new__(cls)
+        obj._value_ = value
+        obj.ordinal = len(cls.__members__)
+        return obj
+
     FP16 = "fp16"
     FP32 = "fp32"
     Q2_K = "Q2_K"
@@ -72,7 +252,47 @@ class Quantization(Enum):
     Q8_0 = "Q8_0"
 
 
-@dataclass
+# Format detection bits from detect_model_format, in priority order
+_FORMAT_PRIORITY = (
+    (1, ModelFormat.GGUF),
+    (2, ModelFormat.GPTQ),
+    (4, ModelFormat.AWQ),
+    (8, ModelFormat.SAFETENSORS),
+    (16, ModelFormat.PYTORCH),
+)
+
+# Quantization lookup for CLI input
+_QUANT_BY_VALUE = {q.value: q for q in Quantization}
+
+# Bytes per parameter, indexed by Quantization.ordinal (keep in member order)
+_BYTES_PER_PARAM = (
+    2.0,    # FP16
+    4.0,    # FP32
+    0.25,   # Q2_K
+    0.375,  # Q3_K_S
+    0.375,  # Q3_K_M
+    0.375,  # Q3_K_L
+    0.5,    # Q4_0
+    0.5,    # Q4_1
+    0.5,    # Q4_K_S
+    0.5,    # Q4_K_M
+    0.625,  # Q5_0
+    0.625,  # Q5_1
+    0.625,  # Q5_K_S
+    0.625,  # Q5_K_M
+    0.75,   # Q6_K
+    1.0,    # Q8_0
+)
+assert len(_BYTES_PER_PARAM) == len(Quantization)
+_BYTES_PER_PARAM_ARRAY = np.array(_BYTES_PER_PARAM, dtype=np.float64)
+
+_INV_GIB = 1.0 / (1024**3)
+
+# Quantizations whose VRAM needs are recorded for every downloaded model
+_COMMON_QUANTIZATIONS = (Quantization.Q4_K_M, Quantization.Q5_K_M, Quantization.FP16)
+
+
+@dataclass(frozen=True, slots=True)
 class GPUSpec:
     name: str
     vram_gb: int
@@ -100,7 +320,62 @@ class ModelInfo:
     checksum: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True)
+class ModelMeta:
+    """Config fields needed for parameter, size and VRAM estimates"""
+    model_type: str
+    vocab_size: int
+    hidden_size: int
+    num_hidden_layers: int
+    intermediate_size: int
+    max_position_embeddings: int
+    num_parameters: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config) -> "ModelMeta":
+        hidden_size = getattr(config, 'hidden_size', 4096)
+        return cls(
+            model_type=getattr(config, 'model_type', "unknown"),
+            vocab_size=getattr(config, 'vocab_size', 32000),
+            hidden_size=hidden_size,
+            num_hidden_layers=getattr(config, 'num_hidden_layers', 32),
+            intermediate_size=getattr(config, 'intermediate_size', hidden_size * 4),
+            max_position_embeddings=getattr(config, 'max_position_embeddings', 4096),
+            num_parameters=getattr(config, 'num_parameters', None)
+        )
+
+
+# GPU catalog with current pricing, shared by every ModelManager
+_GPU_DATABASE: Tuple[GPUSpec, ...] = (
+    # RunPod GPUs (current pricing as of 2024)
+    GPUSpec("RTX 4090", 24, 1008, 8.9, 0.40, "runpod"),
+    GPUSpec("RTX 3090", 24, 936, 8.6, 0.35, "runpod"),
+    GPUSpec("A100 40GB", 40, 1555, 8.0, 1.50, "runpod"),
+    GPUSpec("A100 80GB", 80, 1935, 8.0, 2.50, "runpod"),
+    GPUSpec("H100 80GB", 80, 3350, 9.0, 4.00, "runpod"),
+    GPUSpec("V100 32GB", 32, 900, 7.0, 0.80, "runpod"),
+
+    # Vast.ai approximate pricing (variable)
+    GPUSpec("RTX 4090", 24, 1008, 8.9, 0.25, "vast"),
+    GPUSpec("RTX 3090", 24, 936, 8.6, 0.20, "vast"),
+    GPUSpec("A100 40GB", 40, 1555, 8.0, 0.80, "vast"),
+    GPUSpec("A100 80GB", 80, 1935, 8.0, 1.20, "vast"),
+    GPUSpec("V100 32GB", 32, 900, 7.0, 0.45, "vast"),
+)
+
+# Column layout of the GPU catalog array; float64 so budget comparisons match the Python floats
+_GPU_DTYPE = np.dtype([("vram", "f8"), ("bw", "f8"), ("cc", "f8"), ("cost", "f8")])
+
+
+def _gpu_array(gpus: Tuple[GPUSpec, ...]) -> np.ndarray:
+    """Structured array of the catalog, row i describing gpus[i]"""
+    return np.array(
+        [(g.vram_gb, g.memory_bandwidth_gbps, g.compute_capability, g.hourly_cost_usd) for g in gpus],
+        dtype=_GPU_DTYPE,
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class VRAMEstimate:
     model_size_gb: float
     context_size_gb: float
@@ -116,41 +391,70 @@ class ModelManager:
     """Comprehensive model management with privacy focus"""
 
     def __init__(self, config_path: str = "/app/configs/model-config.json"):
+        # Setup logging first, loading the model database may already log
+        self._setup_logging()
+
         self.config_path = Path(config_path)
         self.models_dir = Path(os.getenv("MODEL_STORAGE_PATH", "/app/models"))
         self.data_dir = Path("/app/data")
         self.hf_token = os.getenv("HF_TOKEN")
         self.encryption_key = self._get_or_create_encryption_key()
+        self.model_cipher = self._init_model_cipher()
 
-        # GPU database with current pricing
+        # GPU database with current pricing, plus a column view for vectorized filtering
         self.gpu_database = self._load_gpu_database()
+        self._gpu_arr = _gpu_array(self.gpu_database)
+        self._gpu_by_cost = sorted(self.gpu_database, key=lambda gpu: gpu.hourly_cost_usd)
 
         # Model database
         self.model_db_path = self.data_dir / "models.json"
         self.model_db = self._load_model_database()
+        self._total_size_gb = sum(model.size_gb for model in self.model_db.values())
+
+        # (expiry, free GB) of the last disk usage reading
+        self._disk_cache = (0.0, 0.0)
+
+        # HuggingFace config cache (in-process, backed by small JSON files)
+        self.hf_cache_dir = self.data_dir / "hf_cache"
+        self._meta_cache: Dict[str, ModelMeta] = {}
+        self._vram_cache: Dict[Tuple[ModelMeta, Quantization, int, int], VRAMEstimate] = {}
+
+        # Negative cache: model id -> monotonic time until which it is known missing
+        self._missing_models: Dict[str, float] = {}
 
         # Privacy settings
         self.privacy_mode = os.getenv("PRIVACY_MODE", "maximum") == "maximum"
         self.encrypt_storage = os.getenv("ENCRYPT_STORAGE", "true") == "true"
 
+        # "aria2" fetches repository files with multi-connection range GETs
+        self.download_backend = os.getenv("HF_DOWNLOAD_BACKEND", "hub")
+
         # Ensure directories exist
         self.models_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
-
-        # Setup logging
-        self._setup_logging()
+        self.hf_cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _setup_logging(self):
-        """Setup secure logging"""
-        log_level = os.getenv("LOG_LEVEL", "INFO")
-        logging.basicConfig(
-            level=getattr(logging, log_level),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
+        """Setup secure logging, with file and console writes on a background thread"""
+        root = logging.getLogger()
+        # Like basicConfig, leave an already configured root logger alone
+        if not root.handlers:
+            log_level = os.getenv("LOG_LEVEL", "INFO")
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handlers = [
                 logging.FileHandler("/app/logs/model-manager.log"),
                 logging.StreamHandler()
             ]
-        )
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            log_queue = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(log_queue, *handlers)
+            listener.start()
+            atexit.register(listener.stop)
+
+            root.setLevel(getattr(logging, log_level))
+            root.addHandler(logging.handlers.QueueHandler(log_queue))
         self.logger = logging.getLogger("ModelManager")
 
     def _get_or_create_encryption_key(self) -> Fernet:
@@ -168,44 +472,110 @@ class ModelManager:
 
         return Fernet(key)
 
-    def _load_gpu_database(self) -> List[GPUSpec]:
+    def _init_model_cipher(self) -> AESGCM:
+        """Derive the AES-256-GCM model key from the stored encryption key"""
+        with open(self.data_dir / ".encryption_key", "rb") as f:
+            master_key = f.read()
+
+        model_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"private-llm-model-storage"
+        ).derive(master_key)
+
+        return AESGCM(model_key)
+
+    def _load_gpu_database(self) -> Tuple[GPUSpec, ...]:
         """Load GPU specifications and pricing"""
-        return [
-            # RunPod GPUs (current pricing as of 2024)
-            GPUSpec("RTX 4090", 24, 1008, 8.9, 0.40, "runpod"),
-            GPUSpec("RTX 3090", 24, 936, 8.6, 0.35, "runpod"),
-            GPUSpec("A100 40GB", 40, 1555, 8.0, 1.50, "runpod"),
-            GPUSpec("A100 80GB", 80, 1935, 8.0, 2.50, "runpod"),
-            GPUSpec("H100 80GB", 80, 3350, 9.0, 4.00, "runpod"),
-            GPUSpec("V100 32GB", 32, 900, 7.0, 0.80, "runpod"),
-
-            # Vast.ai approximate pricing (variable)
-            GPUSpec("RTX 4090", 24, 1008, 8.9, 0.25, "vast"),
-            GPUSpec("RTX 3090", 24, 936, 8.6, 0.20, "vast"),
-            GPUSpec("A100 40GB", 40, 1555, 8.0, 0.80, "vast"),
-            GPUSpec("A100 80GB", 80, 1935, 8.0, 1.20, "vast"),
-            GPUSpec("V100 32GB", 32, 900, 7.0, 0.45, "vast"),
-        ]
+        return _GPU_DATABASE
 
     def _load_model_database(self) -> Dict[str, ModelInfo]:
         """Load model database from disk"""
         if self.model_db_path.exists():
             try:
-                with open(self.model_db_path, "r") as f:
-                    data = json.load(f)
+                if orjson is not None:
+                    data = orjson.loads(self.model_db_path.read_bytes())
+                else:
+                    with open(self.model_db_path, "r") as f:
+                        data = json.load(f)
                 return {k: ModelInfo(**v) for k, v in data.items()}
             except Exception as e:
-                self.logger.error(f"Failed to load model database: {e}")
+                self.logger.error("Failed to load model database: %s", e)
         return {}
 
     def _save_model_database(self):
         """Save model database to disk"""
         try:
+            if orjson is not None:
+                # orjson walks the dataclasses natively and writes enums by value
+                self.model_db_path.write_bytes(orjson.dumps(
+                    self.model_db,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS,
+                ))
+                return
             data = {k: asdict(v) for k, v in self.model_db.items()}
             with open(self.model_db_path, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+                json.dump(data, f, indent=2, default=_json_default)
+        except Exception as e:
+            self.logger.error("Failed to save model database: %s", e)
+
+    def _meta_cache_path(self, model_id: str) -> Path:
+        return self.hf_cache_dir / f"{model_id.replace('/', '__')}.json"
+
+    def _store_model_meta(self, model_id: str, meta: ModelMeta):
+        """Remember model metadata in memory and on disk"""
+        self._meta_cache[model_id] = meta
+        try:
+            with open(self._meta_cache_path(model_id), "w") as f:
+                json.dump(asdict(meta), f)
+        except Exception as e:
+            self.logger.warning("Failed to cache metadata for %s: %s", model_id, e)
+
+    def _check_model_exists(self, model_id: str):
+        """Fail fast for model ids HuggingFace recently reported as missing"""
+        expiry = self._missing_models.get(model_id)
+        if expiry is None:
+            return
+        if time.monotonic() < expiry:
+            raise ModelNotFoundError(f"Model not found on HuggingFace: {model_id}")
+        del self._missing_models[model_id]
+
+    def _record_missing_model(self, model_id: str, error: Exception):
+        """Remember model_id as missing if error is a repository 404"""
+        if _is_repository_not_found(error):
+            self._missing_models[model_id] = time.monotonic() + MISSING_MODEL_TTL
+            raise ModelNotFoundError(f"Model not found on HuggingFace: {model_id}") from error
+
+    def _fetch_model_meta(self, model_id: str) -> ModelMeta:
+        """Get model metadata, hitting the network only on a cold cache"""
+        meta = self._meta_cache.get(model_id)
+        if meta is not None:
+            return meta
+
+        try:
+            with open(self._meta_cache_path(model_id), "r") as f:
+                meta = ModelMeta(**json.load(f))
+            self._meta_cache[model_id] = meta
+            return meta
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            self.logger.error(f"Failed to save model database: {e}")
+            self.logger.warning("Ignoring unreadable metadata cache for %s: %s", model_id, e)
+
+        # Imported here: transformers is slow to import and only needed on a cache miss
+        from transformers import AutoConfig
+
+        self._check_model_exists(model_id)
+        try:
+            config = AutoConfig.from_pretrained(model_id, token=self.hf_token)
+        except Exception as e:
+            self._record_missing_model(model_id, e)
+            raise
+        meta = ModelMeta.from_config(config)
+        self._store_model_meta(model_id, meta)
+        return meta
 
     def calculate_vram_requirements(
         self,
@@ -217,95 +587,121 @@ class ModelManager:
         """Calculate precise VRAM requirements for a model"""
 
         try:
-            # Get model info from HuggingFace
-            info = model_info(model_id, token=self.hf_token)
-            config = AutoConfig.from_pretrained(model_id, token=self.hf_token)
-
-            # Extract parameters
-            if hasattr(config, 'num_parameters'):
-                params = config.num_parameters
-            else:
-                # Estimate from architecture
-                params = self._estimate_parameters(config)
-
-            # Calculate model size based on quantization
-            model_size_gb = self._calculate_model_size(params, quantization)
-
-            # Calculate context memory requirements
-            hidden_size = getattr(config, 'hidden_size', 4096)
-            context_size_gb = (
-                context_length * hidden_size * 2 * batch_size * 1e-9
-            )  # 2 bytes per fp16
-
-            # System overhead (KV cache, activations, etc.)
-            overhead_gb = max(2.0, model_size_gb * 0.15)
-
-            total_gb = model_size_gb + context_size_gb + overhead_gb
-            recommended_gpu_gb = total_gb * 1.2  # 20% safety margin
-
-            # Find suitable GPUs
-            suitable_gpus = [
-                gpu for gpu in self.gpu_database
-                if gpu.vram_gb >= recommended_gpu_gb
-            ]
-            suitable_gpus.sort(key=lambda x: x.hourly_cost_usd)
-
-            # Calculate cost metrics
-            cost_per_hour = suitable_gpus[0].hourly_cost_usd if suitable_gpus else 0
-
-            # Estimate tokens per dollar (rough calculation)
-            tokens_per_second = self._estimate_throughput(params, suitable_gpus[0] if suitable_gpus else None)
-            tokens_per_hour = tokens_per_second * 3600
-            tokens_per_dollar = tokens_per_hour / cost_per_hour if cost_per_hour > 0 else 0
-
-            return VRAMEstimate(
-                model_size_gb=model_size_gb,
-                context_size_gb=context_size_gb,
-                overhead_gb=overhead_gb,
-                total_gb=total_gb,
-                recommended_gpu_gb=recommended_gpu_gb,
-                recommended_gpus=suitable_gpus[:3],  # Top 3 recommendations
-                cost_per_hour=cost_per_hour,
-                tokens_per_dollar=tokens_per_dollar
-            )
+            # Get model config from HuggingFace (cached)
+            meta = self._fetch_model_meta(model_id)
+            return self._estimate_vram(meta, quantization, context_length, batch_size)
 
         except Exception as e:
-            self.logger.error(f"Failed to calculate VRAM for {model_id}: {e}")
+            self.logger.error("Failed to calculate VRAM for %s: %s", model_id, e)
             raise
 
+    def _estimate_vram(
+        self,
+        meta: ModelMeta,
+        quantization: Quantization = Quantization.Q4_K_M,
+        context_length: int = 4096,
+        batch_size: int = 1
+    ) -> VRAMEstimate:
+        """VRAM estimate for already-fetched metadata, memoized per argument set"""
+        key = (meta, quantization, context_length, batch_size)
+        estimate = self._vram_cache.get(key)
+        if estimate is None:
+            estimate = self._vram_cache[key] = self._compute_vram(meta, quantization, context_length, batch_size)
+        return estimate
+
+    def _compute_vram(
+        self,
+        meta: ModelMeta,
+        quantization: Quantization,
+        context_length: int,
+        batch_size: int
+    ) -> VRAMEstimate:
+        """Calculate precise VRAM requirements from model metadata"""
+        # Extract parameters
+        if meta.num_parameters is not None:
+            params = meta.num_parameters
+        else:
+            # Estimate from architecture
+            params = self._estimate_parameters(meta)
+
+        # Calculate model size based on quantization
+        model_size_gb = self._calculate_model_size(params, quantization)
+
+        # Calculate context memory requirements
+        context_size_gb = (
+            context_length * meta.hidden_size * 2 * batch_size * 1e-9
+        )  # 2 bytes per fp16
+
+        # System overhead (KV cache, activations, etc.)
+        overhead_gb = max(2.0, model_size_gb * 0.15)
+
+        total_gb = model_size_gb + context_size_gb + overhead_gb
+        recommended_gpu_gb = total_gb * 1.2  # 20% safety margin
+
+        # Find the cheapest suitable GPUs (catalog is pre-sorted by cost)
+        suitable_gpus = []
+        for gpu in self._gpu_by_cost:
+            if gpu.vram_gb >= recommended_gpu_gb:
+                suitable_gpus.append(gpu)
+                if len(suitable_gpus) == 3:
+                    break
+
+        # Calculate cost metrics
+        cost_per_hour = suitable_gpus[0].hourly_cost_usd if suitable_gpus else 0
+
+        # Estimate tokens per dollar (rough calculation)
+        tokens_per_second = self._estimate_throughput(params, suitable_gpus[0] if suitable_gpus else None)
+        tokens_per_hour = tokens_per_second * 3600
+        tokens_per_dollar = tokens_per_hour / cost_per_hour if cost_per_hour > 0 else 0
+
+        return VRAMEstimate(
+            model_size_gb=model_size_gb,
+            context_size_gb=context_size_gb,
+            overhead_gb=overhead_gb,
+            total_gb=total_gb,
+            recommended_gpu_gb=recommended_gpu_gb,
+            recommended_gpus=suitable_gpus,  # Top 3 recommendations
+            cost_per_hour=cost_per_hour,
+            tokens_per_dollar=tokens_per_dollar
+        )
+
+    def _vram_for_quants(
+        self,
+        meta: ModelMeta,
+        quantizations: List[Quantization],
+        context_length: int = 4096,
+        batch_size: int = 1
+    ) -> Dict[str, float]:
+        """Total VRAM (GB) per quantization value, computed for all quantizations at once"""
+        params = meta.num_parameters if meta.num_parameters is not None else self._estimate_parameters(meta)
+        model_size_gb = self._calculate_model_sizes(params, quantizations)
+        context_size_gb = context_length * meta.hidden_size * 2 * batch_size * 1e-9
+        total_gb = model_size_gb + context_size_gb + np.maximum(2.0, model_size_gb * 0.15)
+        return {q.value: total for q, total in zip(quantizations, total_gb.tolist())}
+
     def _calculate_model_size(self, params: int, quantization: Quantization) -> float:
         """Calculate model size based on parameters and quantization"""
+        return params * _BYTES_PER_PARAM[quantization.ordinal] * _INV_GIB
 
-        # Bytes per parameter based on quantization
-        bytes_per_param = {
-            Quantization.FP32: 4.0,
-            Quantization.FP16: 2.0,
-            Quantization.Q8_0: 1.0,
-            Quantization.Q6_K: 0.75,
-            Quantization.Q5_K_M: 0.625,
-            Quantization.Q5_K_S: 0.625,
-            Quantization.Q5_1: 0.625,
-            Quantization.Q5_0: 0.625,
-            Quantization.Q4_K_M: 0.5,
-            Quantization.Q4_K_S: 0.5,
-            Quantization.Q4_1: 0.5,
-            Quantization.Q4_0: 0.5,
-            Quantization.Q3_K_L: 0.375,
-            Quantization.Q3_K_M: 0.375,
-            Quantization.Q3_K_S: 0.375,
-            Quantization.Q2_K: 0.25,
-        }
-
-        return (params * bytes_per_param.get(quantization, 2.0)) / (1024**3)
+    @staticmethod
+    def _calculate_model_sizes(params, quantizations: List[Quantization]) -> np.ndarray:
+        """Vectorized _calculate_model_size over arrays of parameter counts and quantizations"""
+        ordinals = np.fromiter((q.ordinal for q in quantizations), dtype=np.intp, count=len(quantizations))
+        return np.asarray(params, dtype=np.float64) * _BYTES_PER_PARAM_ARRAY[ordinals] * _INV_GIB
 
-    def _estimate_parameters(self, config) -> int:
+    def _estimate_parameters(self, meta: ModelMeta) -> int:
         """Estimate parameters from model config"""
-
-        # Common parameter estimation formulas
-        vocab_size = getattr(config, 'vocab_size', 32000)
-        hidden_size = getattr(config, 'hidden_size', 4096)
-        num_layers = getattr(config, 'num_hidden_layers', 32)
-        intermediate_size = getattr(config, 'intermediate_size', hidden_size * 4)
+        return int(self._estimate_parameters_batch(
+            meta.vocab_size, meta.hidden_size, meta.num_hidden_layers, meta.intermediate_size
+        )[0])
+
+    @staticmethod
+    def _estimate_parameters_batch(vocab_size, hidden_size, num_layers, intermediate_size) -> np.ndarray:
+        """Estimate parameters for many configs at once (array-like inputs)"""
+        vocab_size = np.atleast_1d(np.asarray(vocab_size, dtype=np.int64))
+        hidden_size = np.atleast_1d(np.asarray(hidden_size, dtype=np.int64))
+        num_layers = np.atleast_1d(np.asarray(num_layers, dtype=np.int64))
+        intermediate_size = np.atleast_1d(np.asarray(intermediate_size, dtype=np.int64))
 
         # Embedding parameters
         embed_params = vocab_size * hidden_size
@@ -354,21 +750,26 @@ class ModelManager:
     def detect_model_format(self, model_path: Path) -> ModelFormat:
         """Detect model format from files"""
 
-        files = list(model_path.glob("*"))
-        file_names = [f.name.lower() for f in files]
-
-        if any(f.endswith('.gguf') for f in file_names):
-            return ModelFormat.GGUF
-        elif any('gptq' in f for f in file_names):
-            return ModelFormat.GPTQ
-        elif any('awq' in f for f in file_names):
-            return ModelFormat.AWQ
-        elif any(f.endswith('.safetensors') for f in file_names):
-            return ModelFormat.SAFETENSORS
-        elif any(f.endswith('.bin') for f in file_names):
-            return ModelFormat.PYTORCH
-        else:
-            return ModelFormat.UNKNOWN
+        # One pass over the directory, recording which markers were seen
+        flags = 0
+        with os.scandir(model_path) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                flags |= (
+                    name.endswith('.gguf')
+                    | ('gptq' in name) << 1
+                    | ('awq' in name) << 2
+                    | name.endswith('.safetensors') << 3
+                    | name.endswith('.bin') << 4
+                )
+                if flags & 1:
+                    # GGUF has the highest priority, nothing else can change the result
+                    break
+
+        for bit, model_format in _FORMAT_PRIORITY:
+            if flags & bit:
+                return model_format
+        return ModelFormat.UNKNOWN
 
     def download_model_file_robust(
         self,
@@ -390,22 +791,22 @@ class ModelManager:
             True if download successful, False otherwise
         """
         try:
-            self.logger.info(f"{ICONS['download']} Starting robust download: {filename}")
+            self.logger.info("%s Starting robust download: %s", ICONS['download'], filename)
 
             # Check if download utils are available
             if not DOWNLOAD_UTILS_AVAILABLE:
-                self.logger.warning(f"{ICONS['warning']} download_utils not available, using fallback")
+                self.logger.warning("%s download_utils not available, using fallback", ICONS['warning'])
                 return self._fallback_download(url, output_dir, filename)
 
             # Pre-flight check for aria2c
             if not ensure_aria2():
-                self.logger.warning(f"{ICONS['warning']} aria2c not available, falling back to requests")
+                self.logger.warning("%s aria2c not available, falling back to requests", ICONS['warning'])
                 return self._fallback_download(url, output_dir, filename)
 
             # Get download info
             download_info = get_download_info(url)
             if not download_info.get('valid', False):
-                self.logger.error(f"{ICONS['error']} Invalid download URL: {url}")
+                self.logger.error("%s Invalid download URL: %s", ICONS['error'], url)
                 return False
 
             # Use atomic download with our robust system
@@ -418,17 +819,17 @@ class ModelManager:
             )
 
             if success:
-                self.logger.info(f"{ICONS['success']} Robust download completed: {filename}")
+                self.logger.info("%s Robust download completed: %s", ICONS['success'], filename)
             else:
-                self.logger.error(f"{ICONS['error']} Robust download failed: {filename}")
+                self.logger.error("%s Robust download failed: %s", ICONS['error'], filename)
 
             return success
 
         except (DownloadError, ValidationError) as e:
-            self.logger.error(f"{ICONS['error']} Download error: {e}")
+            self.logger.error("%s Download error: %s", ICONS['error'], e)
             return False
         except Exception as e:
-            self.logger.error(f"{ICONS['error']} Unexpected error in robust download: {e}")
+            self.logger.error("%s Unexpected error in robust download: %s", ICONS['error'], e)
             return False
 
     def _fallback_download(self, url: str, output_dir: Path, filename: str) -> bool:
@@ -444,7 +845,7 @@ class ModelManager:
             True if download successful, False otherwise
         """
         try:
-            self.logger.info(f"{ICONS['warning']} Using fallback download method")
+            self.logger.info("%s Using fallback download method", ICONS['warning'])
 
             output_dir.mkdir(parents=True, exist_ok=True)
             file_path = output_dir / filename
@@ -471,14 +872,14 @@ class ModelManager:
 
             # Validate file size
             if file_path.stat().st_size < 1024 * 1024:  # 1MB minimum
-                self.logger.error(f"{ICONS['error']} Downloaded file too small")
+                self.logger.error("%s Downloaded file too small", ICONS['error'])
                 return False
 
-            self.logger.info(f"{ICONS['success']} Fallback download completed")
+            self.logger.info("%s Fallback download completed", ICONS['success'])
             return True
 
         except Exception as e:
-            self.logger.error(f"{ICONS['error']} Fallback download failed: {e}")
+            self.logger.error("%s Fallback download failed: %s", ICONS['error'], e)
             return False
 
     async def download_model(
@@ -488,46 +889,69 @@ class ModelManager:
         force_download: bool = False
     ) -> ModelInfo:
         """Download model from HuggingFace with privacy controls"""
+        from huggingface_hub import snapshot_download
+        from transformers import AutoConfig
 
         try:
-            self.logger.info(f"Starting download of {model_id}")
+            self.logger.info("Starting download of %s", model_id)
 
             # Check if model already exists
             if model_id in self.model_db and not force_download:
                 return self.model_db[model_id]
 
+            # Skip the network for ids that recently 404'd
+            self._check_model_exists(model_id)
+
             # Create model directory
             model_dir = self.models_dir / model_id.replace("/", "_")
             model_dir.mkdir(parents=True, exist_ok=True)
 
             # Download model files
-            if self.privacy_mode:
-                # In privacy mode, only download once then disconnect
-                local_path = snapshot_download(
-                    model_id,
-                    cache_dir=str(model_dir),
-                    token=self.hf_token,
-                    local_files_only=False
-                )
-            else:
-                local_path = snapshot_download(
-                    model_id,
-                    cache_dir=str(model_dir),
-                    token=self.hf_token
-                )
+            try:
+                if self.download_backend == "aria2" and DOWNLOAD_UTILS_AVAILABLE and ensure_aria2():
+                    local_path = await asyncio.to_thread(self._download_via_aria2, model_id, model_dir)
+                elif self.privacy_mode:
+                    # In privacy mode, only download once then disconnect
+                    local_path = snapshot_download(
+                        model_id,
+                        cache_dir=str(model_dir),
+                        token=self.hf_token,
+                        local_files_only=False,
+                        max_workers=SNAPSHOT_MAX_WORKERS
+                    )
+                else:
+                    local_path = snapshot_download(
+                        model_id,
+                        cache_dir=str(model_dir),
+                        token=self.hf_token,
+                        max_workers=SNAPSHOT_MAX_WORKERS
+                    )
+            except Exception as e:
+                self._record_missing_model(model_id, e)
+                raise
 
-            # Get model info
-            config = AutoConfig.from_pretrained(local_path)
+            # Get model info (cached so the VRAM estimates below skip the network)
+            meta = ModelMeta.from_config(AutoConfig.from_pretrained(local_path))
+            self._store_model_meta(model_id, meta)
 
             # Calculate model info
-            params = self._estimate_parameters(config)
+            params = self._estimate_parameters(meta)
             format_detected = self.detect_model_format(Path(local_path))
 
-            # Calculate size
-            total_size = sum(
-                f.stat().st_size for f in Path(local_path).rglob("*")
-                if f.is_file()
-            ) / (1024**3)
+            # Calculate size, keeping the file list for the checksum
+            files = _scan_files(Path(local_path))
+            total_size = sum(size for _, _, size in files) * _INV_GIB
+
+            # Hashing/encryption and the VRAM estimates run concurrently off the event loop.
+            # Encryption removes the plaintext, so it produces the checksum in the same pass
+            if self.encrypt_storage:
+                checksum_task = self._encrypt_model(Path(local_path), files)
+            else:
+                checksum_task = asyncio.to_thread(self._calculate_checksum, Path(local_path), files)
+            checksum, vram_requirements = await asyncio.gather(
+                checksum_task,
+                asyncio.to_thread(self._vram_for_quants, meta, _COMMON_QUANTIZATIONS)
+            )
 
             # Create model info
             model_info_obj = ModelInfo(
@@ -537,56 +961,230 @@ class ModelManager:
                 parameters=params,
                 format=format_detected,
                 quantization=quantization,
-                architecture=config.model_type if hasattr(config, 'model_type') else "unknown",
-                context_length=getattr(config, 'max_position_embeddings', 4096),
-                vram_requirements={},
+                architecture=meta.model_type,
+                context_length=meta.max_position_embeddings,
+                vram_requirements=vram_requirements,
                 supported_formats=[format_detected],
                 local_path=str(local_path),
-                encrypted=False,
-                checksum=self._calculate_checksum(Path(local_path))
+                encrypted=self.encrypt_storage,
+                checksum=checksum
             )
 
-            # Calculate VRAM requirements for common quantizations
-            for quant in [Quantization.Q4_K_M, Quantization.Q5_K_M, Quantization.FP16]:
-                try:
-                    vram_est = self.calculate_vram_requirements(model_id, quant)
-                    model_info_obj.vram_requirements[quant.value] = vram_est.total_gb
-                except:
-                    pass
-
-            # Encrypt if required
-            if self.encrypt_storage:
-                await self._encrypt_model(Path(local_path))
-                model_info_obj.encrypted = True
-
             # Save to database
+            previous = self.model_db.get(model_id)
+            if previous is not None:
+                self._total_size_gb -= previous.size_gb
             self.model_db[model_id] = model_info_obj
+            self._total_size_gb += total_size
             self._save_model_database()
 
-            self.logger.info(f"Successfully downloaded {model_id}")
+            self.logger.info("Successfully downloaded %s", model_id)
             return model_info_obj
 
         except Exception as e:
-            self.logger.error(f"Failed to download {model_id}: {e}")
+            self.logger.error("Failed to download %s: %s", model_id, e)
             raise
 
-    def _calculate_checksum(self, path: Path) -> str:
-        """Calculate checksum for model verification"""
-        hasher = hashlib.sha256()
+    def _download_via_aria2(self, model_id: str, model_dir: Path) -> str:
+        """Download every repository file with one aria2c process, returning the local directory"""
+        from huggingface_hub import HfApi, hf_hub_url
+
+        files = HfApi().list_repo_files(model_id, token=self.hf_token)
+        target_dir = model_dir / "snapshot"
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        urls = [hf_hub_url(model_id, filename) for filename in files]
+        headers = [""] * len(urls)
+        if self.hf_token:
+            # Follow each redirect here so the token only goes to the origin host;
+            # the CDN URLs it hands out are pre-signed and fetched without it
+            with ThreadPoolExecutor(max_workers=SNAPSHOT_MAX_WORKERS) as executor:
+                probes = list(executor.map(lambda url: probe_remote_file(url, self.hf_token), urls))
+            for i, (_, _, resolved_url) in enumerate(probes):
+                if urlparse(resolved_url).netloc != urlparse(urls[i]).netloc:
+                    urls[i] = resolved_url
+                else:
+                    headers[i] = f"  header=Authorization: Bearer {self.hf_token}\n"
 
-        for file_path in sorted(path.rglob("*")):
-            if file_path.is_file():
-                with open(file_path, "rb") as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        hasher.update(chunk)
+        # aria2c input file: one URL per entry followed by indented per-download options.
+        # It may hold the token, so it is private (mkstemp uses 0600) and kept out of model_dir
+        fd, input_name = tempfile.mkstemp(prefix="aria2-", suffix=".txt")
+        input_path = Path(input_name)
+        try:
+            with os.fdopen(fd, "w") as f:
+                for url, filename, header in zip(urls, files, headers):
+                    f.write(f"{url}\n  dir={target_dir}\n  out={filename}\n{header}")
+
+            cmd = [
+                "aria2c",
+                "--console-log-level=warn",
+                "--summary-interval=0",
+                f"--input-file={input_path}",
+                f"--max-concurrent-downloads={SNAPSHOT_MAX_WORKERS}",
+                f"--max-connection-per-server={ARIA2_REPO_CONNECTIONS}",
+                f"--split={ARIA2_REPO_CONNECTIONS}",
+                *ARIA2_TRANSFER_OPTIONS
+            ]
+            returncode, stderr_tail = run_aria2(cmd)
+        finally:
+            input_path.unlink(missing_ok=True)
+
+        # aria2c keeps a .aria2 control file beside any download it did not finish
+        unfinished = [name for name in files if (target_dir / f"{name}.aria2").exists()]
+        if returncode != 0 or unfinished:
+            raise DownloadError(f"aria2c failed for {model_id} (code {returncode}): {stderr_tail}")
+
+        return str(target_dir)
+
+    def _calculate_checksum(self, path: Path, files: Optional[List[Tuple[str, str, int]]] = None) -> str:
+        """Calculate checksum for model verification as <algorithm>:<hex>"""
+        if files is None:
+            files = _scan_files(path)
+
+        # Hash files concurrently, then combine the per-file digests in path order
+        with ThreadPoolExecutor(max_workers=CHECKSUM_WORKERS) as executor:
+            digests = list(executor.map(_hash_file, (file_path for _, file_path, _ in files)))
+
+        return _combine_digests([rel for rel, _, _ in files], digests)
+
+    async def _encrypt_model(self, model_path: Path, files: Optional[List[Tuple[str, str, int]]] = None) -> str:
+        """Encrypt model files for maximum privacy, returning the plaintext checksum"""
+        self.logger.info("Encrypting model at %s", model_path)
+        return await asyncio.to_thread(self._encrypt_model_files, model_path, files)
+
+    def _encrypt_model_files(self, model_path: Path, files: Optional[List[Tuple[str, str, int]]] = None) -> str:
+        """Replace every file under model_path with an AES-GCM encrypted .enc file"""
+        if files is None:
+            files = _scan_files(model_path)
+        relpaths = [rel for rel, _, _ in files if not rel.endswith(ENCRYPTED_MODEL_SUFFIX)]
+
+        digests = []
+        blobs = set()
+        for rel in relpaths:
+            file_path = model_path / rel
+            # HuggingFace snapshots are symlinks into the blob store
+            source = file_path.resolve()
+            target = file_path.with_name(file_path.name + ENCRYPTED_MODEL_SUFFIX)
+            digests.append(self._encrypt_file(source, target, rel))
+            os.unlink(file_path)
+            if source != file_path:
+                blobs.add(source)
+
+        # Several snapshot entries can share one blob, so remove blobs only once all are encrypted
+        for blob in blobs:
+            blob.unlink(missing_ok=True)
+
+        return _combine_digests(relpaths, digests)
+
+    def _encrypt_file(self, source: Path, target: Path, relpath: str) -> str:
+        """Encrypt one file in ENCRYPTION_CHUNK_SIZE chunks straight from a memory map, returning its digest"""
+        size = source.stat().st_size
+        num_chunks = -(-size // ENCRYPTION_CHUNK_SIZE)
+        aad_prefix = f"{relpath}\0{num_chunks}\0".encode()
+
+        hasher = _new_checksum_hasher()
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            self._write_all(fd, [ENCRYPTED_MODEL_MAGIC, struct.pack(">Q", size)])
+            if size:
+                with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for index in range(num_chunks):
+                            start = index * ENCRYPTION_CHUNK_SIZE
+                            chunk = view[start:start + ENCRYPTION_CHUNK_SIZE]
+                            hasher.update(chunk)
+                            # Binding the chunk index and count stops reordering and truncation
+                            nonce = os.urandom(GCM_NONCE_SIZE)
+                            ciphertext = self.model_cipher.encrypt(nonce, chunk, aad_prefix + str(index).encode())
+                            chunk.release()
+                            self._write_all(fd, [nonce, ciphertext])
+                    finally:
+                        view.release()
+        except BaseException:
+            os.close(fd)
+            target.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+        return hasher.hexdigest()
 
+    def _decrypt_file(self, source: Path, target: Path, relpath: str) -> str:
+        """Decrypt one .enc file written by _encrypt_file, returning the plaintext digest"""
+        hasher = _new_checksum_hasher()
+        with open(source, "rb") as f:
+            header = f.read(len(ENCRYPTED_MODEL_MAGIC) + 8)
+            if len(header) != len(ENCRYPTED_MODEL_MAGIC) + 8 or not header.startswith(ENCRYPTED_MODEL_MAGIC):
+                raise ValueError(f"Not an encrypted model file: {source}")
+            size = struct.unpack(">Q", header[len(ENCRYPTED_MODEL_MAGIC):])[0]
+            num_chunks = -(-size // ENCRYPTION_CHUNK_SIZE)
+            aad_prefix = f"{relpath}\0{num_chunks}\0".encode()
+
+            fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                written = 0
+                for index in range(num_chunks):
+                    chunk_size = min(ENCRYPTION_CHUNK_SIZE, size - written)
+                    # Nonce, ciphertext and the 16 byte GCM tag
+                    record = f.read(GCM_NONCE_SIZE + chunk_size + 16)
+                    if len(record) != GCM_NONCE_SIZE + chunk_size + 16:
+                        raise ValueError(f"Truncated encrypted model file: {source}")
+                    # Raises InvalidTag if the chunk was modified, reordered or moved between files
+                    chunk = self.model_cipher.decrypt(
+                        record[:GCM_NONCE_SIZE], record[GCM_NONCE_SIZE:], aad_prefix + str(index).encode()
+                    )
+                    hasher.update(chunk)
+                    self._write_all(fd, [chunk])
+                    written += len(chunk)
+                if written != size or f.read(1):
+                    raise ValueError(f"Encrypted model file size mismatch: {source}")
+            except BaseException:
+                os.close(fd)
+                target.unlink(missing_ok=True)
+                raise
+            os.close(fd)
         return hasher.hexdigest()
 
-    async def _encrypt_model(self, model_path: Path):
-        """Encrypt model files for maximum privacy"""
-        # Implementation would encrypt model files
-        # For now, just log the action
-        self.logger.info(f"Encrypting model at {model_path}")
+    def _decrypt_model_files(self, model_path: Path, output_dir: Path) -> str:
+        """Decrypt every .enc file under model_path into output_dir, returning the plaintext checksum"""
+        files = _scan_files(model_path)
+        relpaths = [rel[:-len(ENCRYPTED_MODEL_SUFFIX)] for rel, _, _ in files if rel.endswith(ENCRYPTED_MODEL_SUFFIX)]
+
+        digests = []
+        for rel in relpaths:
+            target = output_dir / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            digests.append(self._decrypt_file(model_path / (rel + ENCRYPTED_MODEL_SUFFIX), target, rel))
+
+        return _combine_digests(relpaths, digests)
+
+    async def load_model(self, model_id: str, output_dir: Optional[Path] = None) -> Path:
+        """Path to a servable copy of the model, decrypting encrypted storage first"""
+        if model_id not in self.model_db:
+            raise ModelNotFoundError(f"Model not downloaded: {model_id}")
+
+        model = self.model_db[model_id]
+        if not model.encrypted:
+            return Path(model.local_path)
+
+        if output_dir is None:
+            output_dir = self.models_dir / "decrypted" / model_id.replace("/", "_")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.logger.info("Decrypting model %s to %s", model_id, output_dir)
+        checksum = await asyncio.to_thread(self._decrypt_model_files, Path(model.local_path), output_dir)
+        if model.checksum and checksum != model.checksum:
+            await asyncio.to_thread(self._secure_delete_directory, output_dir)
+            raise ValueError(f"Checksum mismatch after decrypting {model_id}")
+
+        return output_dir
+
+    @staticmethod
+    def _write_all(fd: int, buffers: List[bytes]):
+        """os.writev that fails loudly on a short write (e.g. disk full)"""
+        expected = sum(len(b) for b in buffers)
+        written = os.writev(fd, buffers)
+        if written != expected:
+            raise OSError(f"Short write while encrypting model ({written} of {expected} bytes)")
 
     def recommend_optimal_gpu(
         self,
@@ -600,42 +1198,39 @@ class ModelManager:
             # Calculate VRAM requirements
             vram_est = self.calculate_vram_requirements(model_id)
 
-            # Filter GPUs by budget
-            suitable_gpus = vram_est.recommended_gpus
+            # Filter GPUs by VRAM and budget
+            gpus = self._gpu_arr
+            mask = gpus["vram"] >= vram_est.recommended_gpu_gb
             if budget_limit:
-                suitable_gpus = [
-                    gpu for gpu in suitable_gpus
-                    if gpu.hourly_cost_usd <= budget_limit
-                ]
+                mask &= gpus["cost"] <= budget_limit
+            candidates = np.flatnonzero(mask)
 
-            if not suitable_gpus:
+            if not candidates.size:
                 return {"error": "No suitable GPUs found within budget"}
 
             # Score GPUs based on usage pattern
-            scored_gpus = []
-            for gpu in suitable_gpus:
-                if usage_pattern == "batch":
-                    # Prioritize cost efficiency for batch processing
-                    score = vram_est.tokens_per_dollar / gpu.hourly_cost_usd
-                else:
-                    # Prioritize performance for interactive use
-                    score = gpu.compute_capability / gpu.hourly_cost_usd
-
-                scored_gpus.append((score, gpu))
+            cost = gpus["cost"][candidates]
+            if usage_pattern == "batch":
+                # Prioritize cost efficiency for batch processing
+                scores = vram_est.tokens_per_dollar / cost
+            else:
+                # Prioritize performance for interactive use
+                scores = gpus["cc"][candidates] / cost
 
-            scored_gpus.sort(reverse=True)
+            ranked = candidates[np.argsort(-scores, kind="stable")[:3]]
+            best, *alternatives = (self.gpu_database[i] for i in ranked)
 
             return {
                 "model_id": model_id,
                 "vram_estimate": asdict(vram_est),
-                "recommended_gpu": asdict(scored_gpus[0][1]),
-                "alternatives": [asdict(gpu) for _, gpu in scored_gpus[1:3]],
+                "recommended_gpu": asdict(best),
+                "alternatives": [asdict(gpu) for gpu in alternatives],
                 "usage_pattern": usage_pattern,
-                "estimated_cost_per_1k_tokens": scored_gpus[0][1].hourly_cost_usd / (vram_est.tokens_per_dollar / 1000) if vram_est.tokens_per_dollar > 0 else None
+                "estimated_cost_per_1k_tokens": best.hourly_cost_usd / (vram_est.tokens_per_dollar / 1000) if vram_est.tokens_per_dollar > 0 else None
             }
 
         except Exception as e:
-            self.logger.error(f"Failed to recommend GPU for {model_id}: {e}")
+            self.logger.error("Failed to recommend GPU for %s: %s", model_id, e)
             return {"error": str(e)}
 
     def list_models(self) -> List[Dict[str, Any]]:
@@ -658,42 +1253,54 @@ class ModelManager:
                 else:
                     shutil.rmtree(model.local_path)
 
+            # Plaintext copy left behind by load_model
+            decrypted_dir = self.models_dir / "decrypted" / model_id.replace("/", "_")
+            if decrypted_dir.exists():
+                self._secure_delete_directory(decrypted_dir)
+
             # Remove from database
             del self.model_db[model_id]
+            self._total_size_gb -= model.size_gb
             self._save_model_database()
 
-            self.logger.info(f"Deleted model {model_id}")
+            self.logger.info("Deleted model %s", model_id)
             return True
 
         except Exception as e:
-            self.logger.error(f"Failed to delete {model_id}: {e}")
+            self.logger.error("Failed to delete %s: %s", model_id, e)
             return False
 
     def _secure_delete_directory(self, path: Path):
-        """Securely delete directory by overwriting files"""
+        """Securely delete directory by discarding (or overwriting) file blocks"""
         for file_path in path.rglob("*"):
             if file_path.is_file():
-                # Overwrite file with random data
-                size = file_path.stat().st_size
-                with open(file_path, "wb") as f:
-                    f.write(os.urandom(size))
+                fd = os.open(file_path, os.O_WRONLY)
+                try:
+                    size = os.fstat(fd).st_size
+                    # Punching holes lets the SSD drop the blocks instead of rewriting them
+                    if size and not _punch_hole(fd, size):
+                        _overwrite_random(fd, size)
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
 
         shutil.rmtree(path)
 
     def get_system_status(self) -> Dict[str, Any]:
         """Get system status and resource usage"""
 
-        total_models = len(self.model_db)
-        total_size_gb = sum(model.size_gb for model in self.model_db.values())
+        now = time.monotonic()
+        if now >= self._disk_cache[0]:
+            self._disk_cache = (now + DISK_USAGE_TTL, shutil.disk_usage(self.models_dir).free / (1024**3))
 
         return {
-            "total_models": total_models,
-            "total_size_gb": round(total_size_gb, 2),
+            "total_models": len(self.model_db),
+            "total_size_gb": round(self._total_size_gb, 2),
             "models_directory": str(self.models_dir),
             "privacy_mode": self.privacy_mode,
             "encryption_enabled": self.encrypt_storage,
             "available_gpus": len(self.gpu_database),
-            "storage_free_gb": round(shutil.disk_usage(self.models_dir).free / (1024**3), 2)
+            "storage_free_gb": round(self._disk_cache[1], 2)
         }
 
 
@@ -702,12 +1309,13 @@ if __name__ == "__main__":
     import asyncio
 
     parser = argparse.ArgumentParser(description="Private LLM Model Manager")
-    parser.add_argument("command", choices=["download", "list", "delete", "recommend", "status"])
+    parser.add_argument("command", choices=["download", "load", "list", "delete", "recommend", "status"])
     parser.add_argument("--model-id", help="Model ID for download/delete/recommend")
     parser.add_argument("--quantization", help="Quantization level")
     parser.add_argument("--usage-pattern", default="interactive", choices=["interactive", "batch"])
     parser.add_argument("--budget", type=float, help="Budget limit per hour")
     parser.add_argument("--force", action="store_true", help="Force download even if exists")
+    parser.add_argument("--output-dir", help="Directory for the decrypted copy on load")
 
     args = parser.parse_args()
 
@@ -719,19 +1327,24 @@ if __name__ == "__main__":
                 print("Error: --model-id required for download")
                 return
 
-            quant = None
-            if args.quantization:
-                try:
-                    quant = Quantization(args.quantization)
-                except ValueError:
-                    print(f"Invalid quantization: {args.quantization}")
-                    return
+            quant = _QUANT_BY_VALUE.get(args.quantization)
+            if args.quantization and quant is None:
+                print(f"Invalid quantization: {args.quantization}")
+                return
 
             result = await manager.download_model(args.model_id, quant, args.force)
             print(f"Downloaded: {result.model_id}")
             print(f"Size: {result.size_gb:.2f} GB")
             print(f"Parameters: {result.parameters:,}")
 
+        elif args.command == "load":
+            if not args.model_id:
+                print("Error: --model-id required for load")
+                return
+
+            path = await manager.load_model(args.model_id, Path(args.output_dir) if args.output_dir else None)
+            print(f"Model ready at: {path}")
+
         elif args.command == "list":
             models = manager.list_models()
             print(f"Found {len(models)} models:")
@@ -6,14 +6,33 @@ Adapted from Ignition ComfyUI proven patterns for LLM use case
 
 import json
 import time
+import errno
 import os
-import subprocess
+import shutil
+import random
+import select
+import socket
+import struct
 import logging
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
-import psutil
+from typing import Callable, Dict, Any, Optional, List, Tuple, FrozenSet
+from dataclasses import dataclass, field
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# JSON codec for state files without msgpack, working on bytes either way
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +52,152 @@ ICONS = {
     'inactive': '🔴'
 }
 
+# Icon prefixes for %-style log calls on the monitoring path
+_LOG_PREFIX = {k: f"{v} " for k, v in ICONS.items()}
+
+# Linux process connector (netlink) constants for exec/exit notifications
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+NLMSG_DONE = 3
+_NLMSG_HEADER = struct.Struct('=IHHII')
+_CN_MSG_HEADER = struct.Struct('=IIIIHH')
+_PROC_EVENT_HEADER = struct.Struct('=IIQ')
+_PROC_EVENT_IDS = struct.Struct('=II')
+
+# Longest wait for process events before re-checking time and CPU based transitions
+EVENT_IDLE_TIMEOUT = 60
+
+# Seconds probed capabilities recorded in the state file are trusted
+CAPABILITY_CACHE_TTL = 24 * 3600
+
+# Seconds get_status() reuses an activity scan, across processes via status_file
+STATUS_CACHE_TTL = 2.0
+
+# Shortest window a CPU utilisation sample is taken over
+CPU_SAMPLE_MIN_WINDOW = 1.0
+
+# iptables chain holding the privacy rules, jumped to from OUTPUT
+PRIVACY_CHAIN = "PRIVACY"
+
+# Domain categories, stored as bit flags on DomainTrie nodes
+DOMAIN_ALLOW = 1
+DOMAIN_BLOCK = 2
+DOMAIN_STARTUP = 4
+
+# Host names are case-insensitive over ASCII letters only (RFC 4343)
+_ASCII_LOWER = {c: c + 32 for c in range(ord('A'), ord('Z') + 1)}
+
+
+def ascii_lower(host: str) -> str:
+    """Lowercase the ASCII letters of a host name, leaving other characters untouched"""
+    # str.lower is a C fast path for pure-ASCII text; only fall back to the table otherwise
+    return host.lower() if host.isascii() else host.translate(_ASCII_LOWER)
+
+
+def _classify_download_process(name: str, cmdline: bytes) -> Tuple[bool, bool]:
+    """(is aria2c, is a HuggingFace download) for a process name and raw command line"""
+    return 'aria2c' in name, b'huggingface' in cmdline.lower() or b'snapshot_download' in cmdline
+
+
+class DomainTrie:
+    """
+    Domains keyed by reversed DNS labels (co -> huggingface), so a host
+    matches any listed parent domain in O(labels): api.huggingface.co
+    matches huggingface.co. "*" matches every host.
+    """
+    # Node layout: {label: child_node, ..., _FLAGS: category bits}
+    _FLAGS = None
+
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+
+    @staticmethod
+    def _labels(domain: str) -> List[str]:
+        domain = ascii_lower(domain).strip('.')
+        if domain.startswith('*.'):
+            domain = domain[2:]
+        return [] if domain == '*' else domain.split('.')[::-1]
+
+    def add(self, domain: str, category: int):
+        """Tag domain (and so all of its subdomains) with category"""
+        node = self._root
+        for label in self._labels(domain):
+            node = node.setdefault(label, {})
+        node[self._FLAGS] = node.get(self._FLAGS, 0) | category
+
+    def lookup(self, host: str, mask: int = DOMAIN_ALLOW | DOMAIN_BLOCK | DOMAIN_STARTUP) -> int:
+        """Categories in mask of the most specific listed domain covering host, 0 if none"""
+        node = self._root
+        found = node.get(self._FLAGS, 0) & mask
+        for label in ascii_lower(host).rstrip('.').split('.')[::-1]:
+            node = node.get(label)
+            if node is None:
+                break
+            flags = node.get(self._FLAGS, 0) & mask
+            if flags:
+                found = flags
+        return found
+
+    def domains(self, mask: int) -> List[str]:
+        """Listed domains having any category in mask"""
+        result = []
+        stack = [(self._root, [])]
+        while stack:
+            node, labels = stack.pop()
+            if node.get(self._FLAGS, 0) & mask:
+                result.append('.'.join(reversed(labels)) if labels else '*')
+            for label, child in node.items():
+                if label is not self._FLAGS:
+                    stack.append((child, labels + [label]))
+        return sorted(result)
+
+def resolve_ipv4(domain: str) -> List[str]:
+    """Sorted IPv4 addresses of domain, empty if it does not resolve"""
+    try:
+        infos = socket.getaddrinfo(domain, None, socket.AF_INET, socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as e:
+        logger.warning("%sCould not resolve %s, leaving it out of the ruleset: %s",
+                       _LOG_PREFIX['warning'], domain, e)
+        return []
+    return sorted({info[4][0] for info in infos})
+
+
+def build_iptables_ruleset(allowed: FrozenSet[str], blocked: FrozenSet[str], strict: bool = False,
+                           local_networks: Tuple[str, ...] = (),
+                           resolve: Callable[[str], List[str]] = resolve_ipv4) -> str:
+    """
+    Render the privacy chain as iptables-restore input
+    Blocked domains are rejected before allowed ones are accepted; a "*"
+    entry or strict mode rejects everything else except loopback, the
+    local (container) networks and replies on inbound connections.
+    Allowed domains only get rules when there is a catch-all to exempt
+    them from. Domains are resolved here, one address per rule, so a name
+    that does not resolve is skipped instead of failing the whole restore
+    """
+    reject_rest = strict or "*" in blocked
+    lines = ["*filter", f":{PRIVACY_CHAIN} - [0:0]"]
+    # iptables cannot express wildcards
+    lines.extend(f"-A {PRIVACY_CHAIN} -d {address} -j REJECT"
+                 for domain in sorted(blocked) if not domain.startswith('*')
+                 for address in resolve(domain))
+    # Replies to clients of the API; --ctdir REPLY keeps outbound connections
+    # opened in a looser state from surviving the switch to strict
+    lines.append(f"-A {PRIVACY_CHAIN} -m conntrack --ctstate ESTABLISHED,RELATED --ctdir REPLY -j ACCEPT")
+    lines.append(f"-A {PRIVACY_CHAIN} -o lo -j ACCEPT")
+    lines.extend(f"-A {PRIVACY_CHAIN} -d {network} -j ACCEPT" for network in local_networks)
+    if reject_rest:
+        lines.extend(f"-A {PRIVACY_CHAIN} -d {address} -j ACCEPT"
+                     for domain in sorted(allowed) if not domain.startswith('*')
+                     for address in resolve(domain))
+        lines.append(f"-A {PRIVACY_CHAIN} -j REJECT")
+    lines.append("COMMIT")
+    return "\n".join(lines) + "\n"
+
+
 class PrivacyState(Enum):
     """
     Privacy states for phased blocking approach
@@ -45,18 +210,22 @@ class PrivacyState(Enum):
     EMERGENCY_BLOCK = "emergency_block"
     MONITORING_ONLY = "monitoring_only"
 
-@dataclass
+@dataclass(slots=True)
 class PrivacyConfig:
     """Configuration for privacy state management"""
     # State file locations
-    state_file: str = "/app/data/privacy_state.json"
+    state_file: str = "/app/data/privacy_state.msgpack"
     log_file: str = "/app/logs/privacy.log"
+    # Activity snapshot shared by short-lived CLI processes (see get_status)
+    status_file: str = "/app/data/privacy_status.json"
 
     # Timeouts and intervals
     startup_grace_period: int = 300  # 5 minutes
     download_timeout: int = 3600     # 1 hour
     activity_timeout: int = 1800     # 30 minutes
     monitoring_interval: int = 5     # 5 seconds
+    max_monitoring_interval: int = 120  # Backoff cap while nothing changes
+    monitoring_jitter: float = 0.2   # +/- fraction applied to each sleep
 
     # Feature availability flags
     iptables_available: bool = True
@@ -68,6 +237,16 @@ class PrivacyConfig:
     blocked_domains: List[str] = None
     startup_only_domains: List[str] = None
 
+    # Destinations always reachable, e.g. the docker compose bridge networks
+    local_networks: List[str] = None
+
+    # Lookup structures derived from the domain lists in __post_init__
+    _allowed_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _blocked_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _startup_only_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _startup_union: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    domain_trie: DomainTrie = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         if self.allowed_domains is None:
             self.allowed_domains = [
@@ -95,7 +274,32 @@ class PrivacyConfig:
                 "ghcr.io"
             ]
 
-@dataclass
+        if self.local_networks is None:
+            self.local_networks = [
+                "172.20.0.0/24",
+                "172.21.0.0/24"
+            ]
+
+        # The trie is the single matcher for the domain lists: lookups walk it,
+        # and the rule sets are its normalised entries ("*.x.com" -> x.com)
+        self.domain_trie = DomainTrie()
+        for domains, category in ((self.allowed_domains, DOMAIN_ALLOW),
+                                  (self.blocked_domains, DOMAIN_BLOCK),
+                                  (self.startup_only_domains, DOMAIN_STARTUP)):
+            for domain in domains:
+                self.domain_trie.add(domain, category)
+
+        # Immutable views for rule application, built once per config
+        self._allowed_set = frozenset(self.domain_trie.domains(DOMAIN_ALLOW))
+        self._blocked_set = frozenset(self.domain_trie.domains(DOMAIN_BLOCK))
+        self._startup_only_set = frozenset(self.domain_trie.domains(DOMAIN_STARTUP))
+        self._startup_union = self._allowed_set | self._startup_only_set
+
+    def is_allowed_host(self, host: str) -> bool:
+        """Whether host or a parent domain is on the allowed list"""
+        return bool(self.domain_trie.lookup(host, DOMAIN_ALLOW))
+
+@dataclass(slots=True)
 class StateInfo:
     """Information about current privacy state"""
     state: PrivacyState
@@ -120,34 +324,92 @@ class PrivacyStateManager:
         self.state_start_time = time.time()
         self.logger = logging.getLogger(__name__)
 
+        # (monotonic time, aria2c count, HuggingFace count) of the last process scan
+        self._process_scan: Optional[Tuple[float, int, int]] = None
+
+        # Polling backs off while the state and download activity stay the same
+        self._stable_ticks = 0
+        self._current_interval = float(self.config.monitoring_interval)
+        self._last_downloads_active: Optional[bool] = None
+
+        # Per-state tick handlers; each runs only the checks its transitions need
+        self._transition_table = {
+            PrivacyState.STARTUP: self._tick_startup,
+            PrivacyState.DOWNLOADS_ACTIVE: self._tick_downloads,
+            PrivacyState.ACTIVITY_DETECTED: self._tick_activity,
+            PrivacyState.STRICT: self._tick_strict,
+        }
+
+        # Whether OUTPUT is known to jump to the privacy chain
+        self._privacy_chain_hooked = False
+
+        # Rules are only rendered and logged unless enforcement is opted into:
+        # download detection does not yet see model-manager's snapshot_download,
+        # so a live STRICT chain would reject it
+        self._enforce_rules = os.environ.get('PRIVACY_ENFORCE_IPTABLES') == '1'
+
+        # (monotonic time, activity) of the last get_status call
+        self._status_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+
+        # Monotonic time of the last CPU sample; later samples are deltas since then
+        self._cpu_sampled_at: Optional[float] = None
+
+        previous = self._read_state_file()
+
         # Initialize feature detection
-        self._detect_capabilities()
+        self._capabilities_checked_at = time.time()
+        self._detect_capabilities(previous)
 
         # Create necessary directories
         self._ensure_directories()
 
         # Load previous state if available
-        self._load_state()
+        self._load_state(previous)
 
         logger.info(f"{ICONS['privacy']} Privacy State Manager initialized")
         logger.info(f"{ICONS['info']} Current state: {self.current_state.value}")
         logger.info(f"{ICONS['info']} Monitoring only mode: {self.config.monitoring_only_mode}")
 
-    def _detect_capabilities(self):
-        """Detect system capabilities for graceful degradation"""
-        try:
-            # Test iptables availability
-            result = subprocess.run(['iptables', '--version'],
-                                  capture_output=True, text=True, timeout=5)
-            self.config.iptables_available = result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
-            self.config.iptables_available = False
-            logger.warning(f"{ICONS['warning']} iptables not available, using monitoring-only mode")
+    def _detect_capabilities(self, previous: Optional[Dict[str, Any]] = None):
+        """
+        Detect system capabilities for graceful degradation
+        Reuses a recent probe result from the state file, and trusts the
+        config as given when PRIVACY_SKIP_CAPABILITY_PROBE=1
+        """
+        skip_probe = os.environ.get('PRIVACY_SKIP_CAPABILITY_PROBE') == '1'
+        if not skip_probe and not self._reuse_capabilities(previous):
+            self._probe_capabilities()
 
         # If iptables unavailable, force monitoring-only mode
         if not self.config.iptables_available:
             self.config.monitoring_only_mode = True
 
+    def _reuse_capabilities(self, previous: Optional[Dict[str, Any]]) -> bool:
+        """Apply capabilities saved by an earlier run if they are fresh enough"""
+        capabilities = (previous or {}).get('capabilities')
+        if not capabilities:
+            return False
+        checked_at = capabilities.get('checked_at', previous.get('timestamp', 0))
+        if time.time() - checked_at >= CAPABILITY_CACHE_TTL:
+            return False
+
+        self.config.iptables_available = bool(capabilities.get('iptables'))
+        self.config.activity_detection_available = bool(capabilities.get('activity_detection'))
+        self._capabilities_checked_at = checked_at
+        return True
+
+    def _probe_capabilities(self):
+        """Probe iptables and process monitoring support"""
+        import psutil
+
+        # Test iptables availability; rules are loaded through iptables-restore
+        self.config.iptables_available = all(
+            (path := shutil.which(tool)) is not None and os.access(path, os.X_OK)
+            for tool in ('iptables', 'iptables-restore')
+        )
+        if not self.config.iptables_available:
+            logger.warning(f"{ICONS['warning']} iptables not available, using monitoring-only mode")
+
         # Test for activity detection capabilities
         try:
             # Check if we can monitor processes
@@ -165,21 +427,32 @@ class PrivacyStateManager:
         except Exception as e:
             logger.error(f"{ICONS['error']} Failed to create directories: {e}")
 
-    def _load_state(self):
-        """Load previous state from file"""
+    def _read_state_file(self) -> Optional[Dict[str, Any]]:
+        """Read the previous state file, None if missing or unreadable"""
+        try:
+            # Releases before msgpack wrote JSON under a .json name
+            for path in (Path(self.config.state_file),
+                         Path(self.config.state_file).with_suffix('.json')):
+                if path.exists():
+                    with open(path, 'rb') as f:
+                        return self._decode_state(f.read())
+        except Exception as e:
+            logger.warning(f"{ICONS['warning']} Could not load previous state: {e}")
+        return None
+
+    def _load_state(self, state_data: Optional[Dict[str, Any]]):
+        """Restore the previous state if it is recent enough"""
+        if not state_data:
+            return
         try:
-            if Path(self.config.state_file).exists():
-                with open(self.config.state_file, 'r') as f:
-                    state_data = json.load(f)
-
-                # Validate state age
-                state_age = time.time() - state_data.get('timestamp', 0)
-                if state_age < 3600:  # State valid for 1 hour
-                    self.current_state = PrivacyState(state_data['state'])
-                    self.state_start_time = state_data['timestamp']
-                    logger.info(f"{ICONS['success']} Loaded previous state: {self.current_state.value}")
-                else:
-                    logger.info(f"{ICONS['info']} Previous state expired, starting fresh")
+            # Validate state age
+            state_age = time.time() - state_data.get('timestamp', 0)
+            if state_age < 3600:  # State valid for 1 hour
+                self.current_state = PrivacyState(state_data['state'])
+                self.state_start_time = state_data['timestamp']
+                logger.info(f"{ICONS['success']} Loaded previous state: {self.current_state.value}")
+            else:
+                logger.info(f"{ICONS['info']} Previous state expired, starting fresh")
         except Exception as e:
             logger.warning(f"{ICONS['warning']} Could not load previous state: {e}")
 
@@ -192,24 +465,49 @@ class PrivacyStateManager:
                 'monitoring_only': self.config.monitoring_only_mode,
                 'capabilities': {
                     'iptables': self.config.iptables_available,
-                    'activity_detection': self.config.activity_detection_available
+                    'activity_detection': self.config.activity_detection_available,
+                    'checked_at': self._capabilities_checked_at
                 }
             }
 
-            with open(self.config.state_file, 'w') as f:
-                json.dump(state_data, f, indent=2)
+            if msgpack is not None:
+                payload = msgpack.packb(state_data, use_bin_type=True)
+            else:
+                payload = _dumps(state_data)
+
+            # Sync a file beside the target before renaming it over, so a
+            # crash leaves either the old or the new state, never a torn one
+            tmp_path = self.config.state_file + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config.state_file)
         except Exception as e:
             logger.error(f"{ICONS['error']} Failed to save state: {e}")
 
+    @staticmethod
+    def _decode_state(payload: bytes) -> Dict[str, Any]:
+        """Decode a msgpack state file, falling back to the older JSON format"""
+        if msgpack is not None:
+            try:
+                state_data = msgpack.unpackb(payload, raw=False)
+                if isinstance(state_data, dict):
+                    return state_data
+            except (ValueError, msgpack.UnpackException):
+                pass
+        return _loads(payload)
+
     def transition_to_state(self, new_state: PrivacyState, reason: str = ""):
         """Transition to a new privacy state"""
         old_state = self.current_state
         self.current_state = new_state
         self.state_start_time = time.time()
+        self._status_cache = None
 
-        logger.info(f"{ICONS['privacy']} State transition: {old_state.value} → {new_state.value}")
+        logger.info("%sState transition: %s → %s", _LOG_PREFIX['privacy'], old_state.value, new_state.value)
         if reason:
-            logger.info(f"{ICONS['info']} Reason: {reason}")
+            logger.info("%sReason: %s", _LOG_PREFIX['info'], reason)
 
         # Apply state-specific configurations
         self._apply_state_config()
@@ -240,86 +538,191 @@ class PrivacyStateManager:
         logger.info(f"{ICONS['active']} Configuring startup mode - allowing essential services")
 
         # Allow startup domains temporarily
-        allowed = self.config.allowed_domains + self.config.startup_only_domains
-        self._update_network_rules(allowed=allowed, blocked=self.config.blocked_domains)
+        self._update_network_rules(allowed=self.config._startup_union, blocked=self.config._blocked_set)
 
     def _configure_download_mode(self):
         """Configure network for download phase"""
         logger.info(f"{ICONS['download']} Configuring download mode - allowing model downloads")
 
         # Allow model download domains
-        self._update_network_rules(allowed=self.config.allowed_domains,
-                                 blocked=self.config.blocked_domains)
+        self._update_network_rules(allowed=self.config._allowed_set,
+                                 blocked=self.config._blocked_set)
 
     def _configure_strict_mode(self):
         """Configure network for strict privacy mode"""
         logger.info(f"{ICONS['block']} Configuring strict mode - blocking external connections")
 
         # Block most external connections, allow only local
-        self._update_network_rules(allowed=[], blocked=self.config.blocked_domains, strict=True)
+        self._update_network_rules(allowed=frozenset(), blocked=self.config._blocked_set, strict=True)
 
     def _configure_emergency_mode(self):
         """Configure network for emergency privacy mode"""
         logger.info(f"{ICONS['error']} Configuring emergency mode - blocking all external connections")
 
         # Block everything except localhost
-        self._update_network_rules(allowed=[], blocked=["*"], strict=True)
+        self._update_network_rules(allowed=frozenset(), blocked=frozenset({"*"}), strict=True)
 
-    def _update_network_rules(self, allowed: List[str], blocked: List[str], strict: bool = False):
+    def _update_network_rules(self, allowed: FrozenSet[str], blocked: FrozenSet[str], strict: bool = False):
         """Update network rules based on current state"""
         if not self.config.iptables_available:
             logger.info(f"{ICONS['monitoring']} Would update network rules (monitoring-only mode)")
             return
 
         try:
-            # This would implement actual iptables rules in production
-            # For now, we log what would be done
-            logger.info(f"{ICONS['privacy']} Network rules update:")
-            logger.info(f"  Allowed domains: {allowed}")
-            logger.info(f"  Blocked domains: {blocked}")
-            logger.info(f"  Strict mode: {strict}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("%sNetwork rules update:", _LOG_PREFIX['privacy'])
+                logger.info("  Allowed domains: %s", sorted(allowed))
+                logger.info("  Blocked domains: %s", sorted(blocked))
+                logger.info("  Strict mode: %s", strict)
 
-            # In a real implementation, this would call iptables commands
-            # self._apply_iptables_rules(allowed, blocked, strict)
+            self._apply_iptables_rules(allowed, blocked, strict)
 
         except Exception as e:
             logger.error(f"{ICONS['error']} Failed to update network rules: {e}")
 
+    def _apply_iptables_rules(self, allowed: FrozenSet[str], blocked: FrozenSet[str], strict: bool):
+        """Replace the privacy chain in one iptables-restore call (PRIVACY_ENFORCE_IPTABLES=1)"""
+        import subprocess
+
+        if not self._enforce_rules:
+            # Render with the names as-is so logging the ruleset costs no DNS lookups
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Would load ruleset:\n%s", build_iptables_ruleset(
+                    allowed, blocked, strict, tuple(self.config.local_networks), resolve=lambda domain: [domain]))
+            return
+
+        ruleset = build_iptables_ruleset(allowed, blocked, strict, tuple(self.config.local_networks))
+        # --noflush keeps other chains intact; redeclaring ours empties it first
+        subprocess.run(['iptables-restore', '--noflush'], input=ruleset,
+                       capture_output=True, text=True, check=True, timeout=30)
+
+        if not self._privacy_chain_hooked:
+            check = subprocess.run(['iptables', '-C', 'OUTPUT', '-j', PRIVACY_CHAIN],
+                                   capture_output=True, timeout=5)
+            if check.returncode != 0:
+                subprocess.run(['iptables', '-I', 'OUTPUT', '1', '-j', PRIVACY_CHAIN],
+                               capture_output=True, check=True, timeout=5)
+            self._privacy_chain_hooked = True
+
+    def classify_host(self, host: str) -> int:
+        """
+        Domain categories that apply to host in the current state
+        Startup-only domains count only while in the startup state
+        """
+        mask = DOMAIN_ALLOW | DOMAIN_BLOCK
+        if self.current_state == PrivacyState.STARTUP:
+            mask |= DOMAIN_STARTUP
+        return self.config.domain_trie.lookup(host, mask)
+
+    def is_host_blocked(self, host: str) -> bool:
+        """Whether host or a parent domain is on the blocked list"""
+        return bool(self.config.domain_trie.lookup(host, DOMAIN_BLOCK))
+
+    def describe_host(self, host: str) -> str:
+        """Human-readable verdict for host in the current state"""
+        flags = self.classify_host(host)
+        # The most specific listed domain decides, blocking first on a tie
+        if flags & DOMAIN_BLOCK:
+            return "blocked"
+        if flags & DOMAIN_ALLOW:
+            return "allowed"
+        if flags & DOMAIN_STARTUP:
+            return "allowed (startup only)"
+        return "rejected" if self.current_state in (PrivacyState.STRICT, PrivacyState.EMERGENCY_BLOCK) else "not listed"
+
     def check_download_activity(self) -> bool:
         """Check if downloads are currently active"""
         try:
-            # Check for aria2c processes
-            aria2_count = 0
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                if 'aria2c' in proc.info['name']:
-                    aria2_count += 1
-
-            # Check for HuggingFace download activity
-            hf_processes = 0
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                cmdline = ' '.join(proc.info['cmdline'] or [])
-                if 'huggingface' in cmdline.lower() or 'snapshot_download' in cmdline:
-                    hf_processes += 1
+            aria2_count, hf_processes = self._scan_processes()
 
             download_active = aria2_count > 0 or hf_processes > 0
 
             if download_active:
-                logger.info(f"{ICONS['download']} Active downloads detected (aria2c: {aria2_count}, hf: {hf_processes})")
+                logger.info("%sActive downloads detected (aria2c: %d, hf: %d)",
+                            _LOG_PREFIX['download'], aria2_count, hf_processes)
 
             return download_active
 
         except Exception as e:
-            logger.error(f"{ICONS['error']} Error checking download activity: {e}")
+            logger.error("%sError checking download activity: %s", _LOG_PREFIX['error'], e)
             return False
 
+    def _scan_processes(self) -> Tuple[int, int]:
+        """
+        Count aria2c and HuggingFace download processes in a single pass
+        Reused for half a monitoring interval so one tick scans /proc once
+        """
+        now = time.monotonic()
+        if self._process_scan and now - self._process_scan[0] < self.config.monitoring_interval / 2:
+            return self._process_scan[1], self._process_scan[2]
+
+        counts = self._scan_proc_fast()
+        if counts is None:
+            counts = self._scan_psutil()
+
+        self._process_scan = (now, *counts)
+        return counts
+
+    @staticmethod
+    def _scan_proc_fast() -> Optional[Tuple[int, int]]:
+        """Count download processes straight from /proc, None where procfs is missing"""
+        try:
+            entries = os.scandir('/proc')
+        except OSError:
+            return None
+
+        aria2_count = 0
+        hf_processes = 0
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{entry.name}/comm') as f:
+                        name = f.read()
+                    # Every process: git, wget or curl can fetch from huggingface.co too
+                    with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                        cmdline = f.read()
+                except OSError:
+                    # Exited mid-scan or not ours to read
+                    continue
+                is_aria2, is_hf = _classify_download_process(name, cmdline)
+                aria2_count += is_aria2
+                hf_processes += is_hf
+
+        return aria2_count, hf_processes
+
+    @staticmethod
+    def _scan_psutil() -> Tuple[int, int]:
+        """Portable process scan for systems without procfs"""
+        import psutil
+
+        aria2_count = 0
+        hf_processes = 0
+        for proc in psutil.process_iter(['name', 'cmdline']):
+            cmdline = '\0'.join(proc.info['cmdline'] or ()).encode(errors='surrogateescape')
+            is_aria2, is_hf = _classify_download_process(proc.info['name'] or '', cmdline)
+            aria2_count += is_aria2
+            hf_processes += is_hf
+        return aria2_count, hf_processes
+
     def check_system_activity(self) -> bool:
         """Check for general system activity that might indicate ongoing work"""
         try:
             if not self.config.activity_detection_available:
                 return False
 
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            import psutil
+
+            # Check CPU usage since the previous sample, only blocking to
+            # complete the minimum window on the first call
+            now = time.monotonic()
+            if self._cpu_sampled_at is None:
+                wait = CPU_SAMPLE_MIN_WINDOW
+            else:
+                wait = CPU_SAMPLE_MIN_WINDOW - (now - self._cpu_sampled_at)
+            cpu_percent = psutil.cpu_percent(interval=wait if wait > 0 else None)
+            self._cpu_sampled_at = time.monotonic()
             high_cpu = cpu_percent > 50
 
             # Check network activity
@@ -333,61 +736,189 @@ class PrivacyStateManager:
             activity_detected = high_cpu  # Simplified for now
 
             if activity_detected:
-                logger.info(f"{ICONS['active']} System activity detected (CPU: {cpu_percent:.1f}%)")
+                logger.info("%sSystem activity detected (CPU: %.1f%%)", _LOG_PREFIX['active'], cpu_percent)
 
             return activity_detected
 
         except Exception as e:
-            logger.error(f"{ICONS['error']} Error checking system activity: {e}")
+            logger.error("%sError checking system activity: %s", _LOG_PREFIX['error'], e)
             return False
 
     def update_state(self):
         """Update privacy state based on current conditions"""
         try:
-            current_time = time.time()
-            state_duration = current_time - self.state_start_time
-
-            downloads_active = self.check_download_activity()
-            system_activity = self.check_system_activity()
+            old_state = self.current_state
+            tick = self._transition_table.get(old_state)
+            # Emergency block is only left explicitly, so it has no handler
+            downloads_active = tick(time.time() - self.state_start_time) if tick else None
+            if downloads_active is None:
+                downloads_active = self._last_downloads_active
 
-            # State transition logic
-            if self.current_state == PrivacyState.STARTUP:
-                if downloads_active:
-                    self.transition_to_state(PrivacyState.DOWNLOADS_ACTIVE, "Downloads detected")
-                elif state_duration > self.config.startup_grace_period:
-                    self.transition_to_state(PrivacyState.STRICT, "Startup grace period expired")
-
-            elif self.current_state == PrivacyState.DOWNLOADS_ACTIVE:
-                if not downloads_active and not system_activity:
-                    self.transition_to_state(PrivacyState.STRICT, "Downloads completed")
-                elif state_duration > self.config.download_timeout:
-                    self.transition_to_state(PrivacyState.STRICT, "Download timeout exceeded")
+            self._update_interval(self.current_state == old_state and downloads_active == self._last_downloads_active)
+            self._last_downloads_active = downloads_active
 
-            elif self.current_state == PrivacyState.ACTIVITY_DETECTED:
-                if not system_activity:
-                    self.transition_to_state(PrivacyState.STRICT, "Activity ceased")
-                elif state_duration > self.config.activity_timeout:
-                    self.transition_to_state(PrivacyState.STRICT, "Activity timeout exceeded")
+        except Exception as e:
+            logger.error("%sError updating state: %s", _LOG_PREFIX['error'], e)
+
+    # Tick handlers return whether downloads are active, or None if they didn't check
+
+    def _tick_startup(self, state_duration: float) -> Optional[bool]:
+        """Leave startup once downloads begin or the grace period runs out"""
+        downloads_active = self.check_download_activity()
+        if downloads_active:
+            self.transition_to_state(PrivacyState.DOWNLOADS_ACTIVE, "Downloads detected")
+        elif state_duration > self.config.startup_grace_period:
+            self.transition_to_state(PrivacyState.STRICT, "Startup grace period expired")
+        return downloads_active
+
+    def _tick_downloads(self, state_duration: float) -> Optional[bool]:
+        """Return to strict once downloads and activity stop, or on timeout"""
+        downloads_active = self.check_download_activity()
+        if not downloads_active and not self.check_system_activity():
+            self.transition_to_state(PrivacyState.STRICT, "Downloads completed")
+        elif state_duration > self.config.download_timeout:
+            self.transition_to_state(PrivacyState.STRICT, "Download timeout exceeded")
+        return downloads_active
+
+    def _tick_activity(self, state_duration: float) -> Optional[bool]:
+        """Return to strict once activity ceases, or on timeout"""
+        if not self.check_system_activity():
+            self.transition_to_state(PrivacyState.STRICT, "Activity ceased")
+        elif state_duration > self.config.activity_timeout:
+            self.transition_to_state(PrivacyState.STRICT, "Activity timeout exceeded")
+        return None
+
+    def _tick_strict(self, state_duration: float) -> Optional[bool]:
+        """Open up for new downloads or detected activity"""
+        downloads_active = self.check_download_activity()
+        if downloads_active:
+            self.transition_to_state(PrivacyState.DOWNLOADS_ACTIVE, "New downloads started")
+        elif self.check_system_activity():
+            self.transition_to_state(PrivacyState.ACTIVITY_DETECTED, "System activity detected")
+        return downloads_active
+
+    def _update_interval(self, stable: bool):
+        """Double the polling interval for each stable tick, snap back on any change"""
+        if stable:
+            self._stable_ticks += 1
+            self._current_interval = min(
+                self.config.max_monitoring_interval,
+                self.config.monitoring_interval * 2 ** min(self._stable_ticks, 6)
+            )
+        else:
+            self._stable_ticks = 0
+            self._current_interval = float(self.config.monitoring_interval)
 
-            elif self.current_state == PrivacyState.STRICT:
-                if downloads_active:
-                    self.transition_to_state(PrivacyState.DOWNLOADS_ACTIVE, "New downloads started")
-                elif system_activity:
-                    self.transition_to_state(PrivacyState.ACTIVITY_DETECTED, "System activity detected")
+    def next_interval(self) -> float:
+        """Current polling interval with jitter so monitors don't wake in lockstep"""
+        jitter = random.uniform(-self.config.monitoring_jitter, self.config.monitoring_jitter)
+        return self._current_interval * (1 + jitter)
 
-        except Exception as e:
-            logger.error(f"{ICONS['error']} Error updating state: {e}")
+    def _open_proc_events(self) -> Optional[socket.socket]:
+        """Subscribe to kernel exec/exit notifications, None if unsupported or not permitted"""
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        except (AttributeError, OSError):
+            return None
+        try:
+            sock.bind((os.getpid(), CN_IDX_PROC))
+            payload = struct.pack('=I', PROC_CN_MCAST_LISTEN)
+            cn_msg = _CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+            sock.send(_NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid()) + cn_msg)
+            sock.setblocking(False)
+            return sock
+        except OSError:
+            sock.close()
+            return None
+
+    def _is_download_process(self, pid: int) -> bool:
+        """Whether a freshly exec'd process looks like a model download"""
+        try:
+            with open(f'/proc/{pid}/comm') as f:
+                name = f.read()
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                cmdline = f.read()
+        except OSError:
+            return False
+        return any(_classify_download_process(name, cmdline))
+
+    def _read_proc_events(self, sock: socket.socket, watched: set) -> bool:
+        """Drain pending notifications, True if a download process started or exited"""
+        relevant = False
+        while True:
+            try:
+                data = sock.recv(65536)
+            except BlockingIOError:
+                return relevant
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                # The connector reports every process on the host and overran the
+                # socket buffer; events were lost, so fall back to a full rescan
+                logger.debug("Process event buffer overrun, rescanning processes")
+                self._process_scan = None
+                return True
+            offset = 0
+            while offset + _NLMSG_HEADER.size <= len(data):
+                msg_len = _NLMSG_HEADER.unpack_from(data, offset)[0]
+                event = offset + _NLMSG_HEADER.size + _CN_MSG_HEADER.size
+                if msg_len < _NLMSG_HEADER.size or event + _PROC_EVENT_HEADER.size + _PROC_EVENT_IDS.size > len(data):
+                    break
+                what = _PROC_EVENT_HEADER.unpack_from(data, event)[0]
+                pid, tgid = _PROC_EVENT_IDS.unpack_from(data, event + _PROC_EVENT_HEADER.size)
+                if what == PROC_EVENT_EXEC and self._is_download_process(tgid):
+                    watched.add(tgid)
+                    relevant = True
+                elif what == PROC_EVENT_EXIT and pid == tgid and tgid in watched:
+                    watched.discard(tgid)
+                    relevant = True
+                offset += (msg_len + 3) & ~3
+
+    def _event_timeout(self) -> float:
+        """How long to wait for process events before re-evaluating the state anyway"""
+        if self.current_state in (PrivacyState.DOWNLOADS_ACTIVE, PrivacyState.ACTIVITY_DETECTED):
+            # Completion and timeouts are checked on the adaptive interval
+            return self.next_interval()
+        if self.current_state == PrivacyState.STARTUP:
+            remaining = self.config.startup_grace_period - (time.time() - self.state_start_time)
+            return max(0.0, min(remaining, EVENT_IDLE_TIMEOUT))
+        return EVENT_IDLE_TIMEOUT
+
+    def run_monitor(self):
+        """
+        Keep the state up to date until interrupted
+        Sleeps until a download process starts or exits when the kernel's
+        process connector is available, otherwise polls on the adaptive interval
+        """
+        sock = self._open_proc_events()
+        if sock is None:
+            logger.info(f"{ICONS['monitoring']} Process events unavailable, polling every {self.config.monitoring_interval}-{self.config.max_monitoring_interval}s")
+            while True:
+                self.update_state()
+                time.sleep(self.next_interval())
+
+        logger.info(f"{ICONS['monitoring']} Watching process events for download activity")
+        watched = set()
+        try:
+            while True:
+                self.update_state()
+                ready, _, _ = select.select([sock], [], [], self._event_timeout())
+                if ready and self._read_proc_events(sock, watched):
+                    # Force a fresh process scan for the new activity
+                    self._process_scan = None
+        finally:
+            sock.close()
 
     def force_emergency_block(self):
         """Force transition to emergency block state"""
         self.transition_to_state(PrivacyState.EMERGENCY_BLOCK, "Emergency block activated")
 
     def get_status(self) -> Dict[str, Any]:
-        """Get comprehensive status information"""
+        """Get comprehensive status information, with activity checks reused for STATUS_CACHE_TTL seconds"""
         current_time = time.time()
         state_duration = current_time - self.state_start_time
 
-        status = {
+        return {
             'current_state': self.current_state.value,
             'state_duration': state_duration,
             'monitoring_only_mode': self.config.monitoring_only_mode,
@@ -395,18 +926,57 @@ class PrivacyStateManager:
                 'iptables_available': self.config.iptables_available,
                 'activity_detection_available': self.config.activity_detection_available
             },
-            'activity': {
-                'downloads_active': self.check_download_activity(),
-                'system_activity': self.check_system_activity()
-            },
+            'activity': dict(self._cached_activity()),
             'configuration': {
-                'allowed_domains': len(self.config.allowed_domains),
-                'blocked_domains': len(self.config.blocked_domains),
+                'allowed_domains': len(self.config._allowed_set),
+                'blocked_domains': len(self.config._blocked_set),
                 'startup_grace_period': self.config.startup_grace_period
             }
         }
 
-        return status
+    def _cached_activity(self) -> Dict[str, bool]:
+        """
+        Download and system activity, the expensive part of a status query
+        Each CLI call is a new process, so the result is also kept in
+        status_file and reused by calls within STATUS_CACHE_TTL seconds
+        """
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < STATUS_CACHE_TTL:
+            return self._status_cache[1]
+
+        activity = self._read_status_file()
+        if activity is None:
+            activity = {
+                'downloads_active': self.check_download_activity(),
+                'system_activity': self.check_system_activity()
+            }
+            self._write_status_file(activity)
+
+        self._status_cache = (now, activity)
+        return activity
+
+    def _read_status_file(self) -> Optional[Dict[str, bool]]:
+        """Activity saved by a recent process, None if missing, stale or from another state"""
+        try:
+            with open(self.config.status_file, 'rb') as f:
+                snapshot = _loads(f.read())
+            if (snapshot['state'] == self.current_state.value
+                    and 0 <= time.time() - snapshot['timestamp'] < STATUS_CACHE_TTL):
+                return snapshot['activity']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _write_status_file(self, activity: Dict[str, bool]):
+        """Share an activity snapshot with the next CLI call"""
+        snapshot = {'state': self.current_state.value, 'timestamp': time.time(), 'activity': activity}
+        tmp_path = self.config.status_file + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(snapshot))
+            os.replace(tmp_path, self.config.status_file)
+        except OSError as e:
+            logger.debug("Could not save status snapshot: %s", e)
 
     def get_detailed_status(self) -> str:
         """Get human-readable detailed status"""
@@ -452,7 +1022,15 @@ if __name__ == "__main__":
         elif command == "update":
             manager.update_state()
             print(f"{ICONS['success']} State updated")
+        elif command == "check" and len(sys.argv) > 2:
+            for host in sys.argv[2:]:
+                print(f"{host}: {manager.describe_host(host)}")
+        elif command == "monitor":
+            try:
+                manager.run_monitor()
+            except KeyboardInterrupt:
+                pass
         else:
-            print(f"Usage: {sys.argv[0]} [status|emergency|update]")
+            print(f"Usage: {sys.argv[0]} [status|emergency|update|monitor|check HOST...]")
     else:
         print(manager.get_detailed_status())
\ No newline at end of file
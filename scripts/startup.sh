@@ -115,6 +115,8 @@ load_configuration() {
     export API_PORT=${API_PORT:-11434}
     export OLLAMA_PORT=${OLLAMA_PORT:-11434}
     export MAX_CONCURRENT_REQUESTS=${MAX_CONCURRENT_REQUESTS:-10}
+    export OLLAMA_NUM_PARALLEL=${OLLAMA_NUM_PARALLEL:-4}
+    export OLLAMA_MAX_LOADED_MODELS=${OLLAMA_MAX_LOADED_MODELS:-1}
     export AUTO_SHUTDOWN_IDLE_MINUTES=${AUTO_SHUTDOWN_IDLE_MINUTES:-30}
 
     # Display configuration
@@ -125,6 +127,7 @@ load_configuration() {
     log "INFO" "  Web UI Port: $WEB_UI_PORT"
     log "INFO" "  API Port: $API_PORT"
     log "INFO" "  Offline Mode: $OFFLINE_MODE"
+    log "INFO" "  Ollama Parallel Requests: $OLLAMA_NUM_PARALLEL"
 }
 
 # Check system requirements
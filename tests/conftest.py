@@ -0,0 +1,9 @@
+"""
+Shared pytest setup for Private LLM Cloud
+"""
+
+import sys
+from pathlib import Path
+
+# Make the modules under scripts/ importable once per session
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
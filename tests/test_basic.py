@@ -2,58 +2,227 @@
 Basic tests for Private LLM Cloud
 """
 
+import os
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
 def test_imports():
-    """Test that core modules can be imported"""
-    try:
-        import sys
-        import os
-        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
-
-        # Test that model manager can be imported
-        # Note: This might fail due to missing dependencies, but syntax should be OK
-        print("✅ Basic import test structure ready")
-        assert True
-    except Exception as e:
-        print(f"Import test failed: {e}")
-        assert False
-
-def test_environment_variables():
+    """Test that core modules can be imported (scripts/ is put on sys.path by conftest.py)"""
+    import privacy_state_manager
+
+    assert privacy_state_manager.PrivacyStateManager
+    print("✅ Basic import test passed")
+
+@pytest.mark.parametrize("pattern", ["API_KEY", "HF_TOKEN", "PRIVACY_MODE"])
+def test_environment_variables(pattern):
     """Test environment variable patterns"""
-    import os
+    # Just test the pattern is a usable environment variable name
+    assert pattern.isupper() and pattern.isidentifier()
+    assert isinstance(os.environ.get(pattern, ""), str)
 
-    # Test that we're using environment variables correctly
-    test_patterns = [
-        "API_KEY",
-        "HF_TOKEN",
-        "PRIVACY_MODE"
-    ]
+@pytest.mark.parametrize("relpath", [
+    "docker/Dockerfile.privacy-focused",
+    "docker/docker-compose.yml",
+    "requirements.txt",
+])
+def test_docker_files_exist(relpath):
+    """Test that Docker configuration files exist"""
+    assert (REPO_ROOT / relpath).is_file(), f"Missing required file: {relpath}"
 
-    # Just test the pattern exists in our code
-    for pattern in test_patterns:
-        print(f"✅ Environment variable pattern {pattern} test ready")
+@pytest.mark.parametrize("host, expected", [
+    ("huggingface.co", True),
+    ("cdn-lfs.huggingface.co", True),
+    ("HuggingFace.CO.", True),
+    ("huggingface.co.evil.com", False),
+    ("nothuggingface.co", False),
+    ("aaa.example.com", False),  # Sorts between example.com's siblings
+    ("api.example.com", True),
+    ("x.api.example.com", True),
+    ("example.com", False),
+    ("sub.wild.org", True),
+    ("wild.org", True),
+    ("co", False),
+    ("", False),
+])
+def test_allowed_host_matching(host, expected):
+    """Suffix matching respects label boundaries, wildcards, case and trailing dots"""
+    import privacy_state_manager as psm
 
-    assert True
+    config = psm.PrivacyConfig(allowed_domains=["huggingface.co", "api.example.com", "*.wild.org", "example.com.aaa"])
+    assert config.is_allowed_host(host) == expected
+    assert bool(config.domain_trie.lookup(host, psm.DOMAIN_ALLOW)) == expected
 
-def test_docker_files_exist():
-    """Test that Docker configuration files exist"""
-    import os
+def test_allowed_host_star_matches_everything():
+    """A "*" entry allows every host"""
+    import privacy_state_manager as psm
+
+    config = psm.PrivacyConfig(allowed_domains=["*"])
+    assert config.is_allowed_host("anything.example")
+    assert config.domain_trie.lookup("anything.example", psm.DOMAIN_ALLOW) == psm.DOMAIN_ALLOW
+
+@pytest.mark.parametrize("host, expected", [
+    ("example.com", "allow"),
+    ("ads.example.com", "block"),
+    ("x.ads.example.com", "block"),
+    ("safe.ads.example.com", "allow"),
+    ("ads.example.com.", "block"),
+    ("badads.example.com", "allow"),
+    ("other.net", None),
+])
+def test_domain_trie_most_specific_entry_wins(host, expected):
+    """The deepest listed parent domain decides the category"""
+    import privacy_state_manager as psm
+
+    trie = psm.DomainTrie()
+    trie.add("example.com", psm.DOMAIN_ALLOW)
+    trie.add("*.ads.example.com", psm.DOMAIN_BLOCK)
+    trie.add("safe.ads.example.com.", psm.DOMAIN_ALLOW)
+    flags = {"allow": psm.DOMAIN_ALLOW, "block": psm.DOMAIN_BLOCK, None: 0}
+    assert trie.lookup(host) == flags[expected]
+    assert trie.domains(psm.DOMAIN_BLOCK) == ["ads.example.com"]
+
+@pytest.mark.parametrize("blocked, host, expected", [
+    (["*.tracker.com"], "a.tracker.com", True),
+    (["*.tracker.com"], "tracker.com", True),
+    (["*.tracker.com"], "A.Tracker.COM.", True),
+    (["*.tracker.com"], "nottracker.com", False),
+    (["*"], "example.org", True),
+    (["*.tracker.com", "*"], "a.tracker.com", True),
+    (["api.mixpanel.com"], "eu.api.mixpanel.com", True),
+    (["api.mixpanel.com"], "mixpanel.com", False),
+])
+def test_blocked_domain_matching(blocked, host, expected):
+    """Wildcard and "*" entries match in the trie and reach the rule sets normalised"""
+    import privacy_state_manager as psm
+
+    config = psm.PrivacyConfig(blocked_domains=blocked)
+    assert bool(config.domain_trie.lookup(host, psm.DOMAIN_BLOCK)) == expected
+    assert not any(domain.startswith("*.") for domain in config._blocked_set)
+    assert ("*" in config._blocked_set) == ("*" in blocked)
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_iptables_ruleset_keeps_replies_and_skips_unresolved(strict):
+    """Inbound replies and local networks stay open, unresolvable names are left out"""
+    import privacy_state_manager as psm
+
+    addresses = {"huggingface.co": ["192.0.2.1", "192.0.2.2"], "tracker.com": ["198.51.100.7"]}
+    ruleset = psm.build_iptables_ruleset(
+        frozenset({"huggingface.co", "missing.invalid"}), frozenset({"tracker.com"}), strict,
+        local_networks=("172.20.0.0/24",), resolve=lambda domain: addresses.get(domain, []),
+    )
+    lines = ruleset.splitlines()
+
+    assert "-A PRIVACY -d 198.51.100.7 -j REJECT" in lines
+    # Allowed hosts only need exempting from a catch-all
+    assert ("-A PRIVACY -d 192.0.2.2 -j ACCEPT" in lines) == strict
+    assert "-A PRIVACY -d 172.20.0.0/24 -j ACCEPT" in lines
+    assert "missing.invalid" not in ruleset
+    conntrack = next(i for i, line in enumerate(lines) if "--ctstate ESTABLISHED,RELATED" in line)
+    assert ("-A PRIVACY -j REJECT" in lines) == strict
+    if strict:
+        assert conntrack < lines.index("-A PRIVACY -j REJECT")
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://huggingface.co/u/r/resolve/main/f.bin", True),
+    ("https://huggingface.co/datasets/u/r/resolve/main/f.bin", True),
+    ("https://huggingface.co/spaces/u/r/resolve/main/f.bin", True),
+    ("https://HuggingFace.co/u/r/resolve/main/f.bin", True),
+    ("https://huggingface.co/u/r/blob/main/f.bin", False),
+    ("https://huggingface.co/models/u/r/resolve/main/f.bin", False),
+    ("https://huggingface.co:443/u/r/resolve/main/f.bin", False),
+    ("https://x@huggingface.co/u/r/resolve/main/f.bin", False),
+    ("https://x:y@HuggingFace.co:8443/u/r/blob/main/f.bin", False),
+])
+def test_huggingface_url_validation(url, expected):
+    """Dataset and space files are accepted and the host is case-insensitive"""
+    pytest.importorskip("requests")
+    import download_utils
+
+    assert download_utils.validate_huggingface_url(url) == expected
+    assert download_utils.get_download_info(url)["valid"] == expected
+    # Every case is a HuggingFace URL, so none may skip format validation
+    assert download_utils._url_source(url)[0] == "huggingface"
+    if not expected:
+        with pytest.raises(download_utils.ValidationError):
+            download_utils.validate_source_url(url)
+
+def _load_model_manager():
+    """Import scripts/model-manager.py, skipping when its heavy dependencies are missing"""
+    import importlib.util
+
+    for dependency in ("cryptography", "httpx", "numpy", "requests", "tqdm"):
+        pytest.importorskip(dependency)
+    spec = importlib.util.spec_from_file_location("model_manager", REPO_ROOT / "scripts" / "model-manager.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.mark.parametrize("size", [0, 5, 3 * 1024 + 7])
+def test_model_encryption_round_trip(tmp_path, monkeypatch, size):
+    """Encrypted model files decrypt to the original bytes and the same checksum"""
+    import logging
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    model_manager = _load_model_manager()
+    # Several chunks per file without allocating 16 MiB test data
+    monkeypatch.setattr(model_manager, "ENCRYPTION_CHUNK_SIZE", 1024)
+
+    manager = object.__new__(model_manager.ModelManager)
+    manager.logger = logging.getLogger("test")
+    manager.model_cipher = AESGCM(AESGCM.generate_key(bit_length=256))
+
+    model_dir = tmp_path / "model"
+    blobs = tmp_path / "blobs"
+    (model_dir / "sub").mkdir(parents=True)
+    blobs.mkdir()
+    data = os.urandom(size)
+    (blobs / "shared").write_bytes(data)
+    # Two snapshot entries pointing at the same blob
+    (model_dir / "weights.bin").symlink_to(blobs / "shared")
+    (model_dir / "sub" / "copy.bin").symlink_to(blobs / "shared")
+    (model_dir / "config.json").write_bytes(b'{"model_type": "test"}')
+
+    plain_checksum = manager._calculate_checksum(model_dir)
+    assert manager._encrypt_model_files(model_dir) == plain_checksum
+    assert not (blobs / "shared").exists()
+    assert (model_dir / "weights.bin.enc").is_file()
+
+    output_dir = tmp_path / "out"
+    assert manager._decrypt_model_files(model_dir, output_dir) == plain_checksum
+    assert (output_dir / "weights.bin").read_bytes() == data
+    assert (output_dir / "sub" / "copy.bin").read_bytes() == data
+
+def test_model_decryption_rejects_tampering(tmp_path, monkeypatch):
+    """A modified chunk or a file moved to another path fails to decrypt"""
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    model_manager = _load_model_manager()
+    monkeypatch.setattr(model_manager, "ENCRYPTION_CHUNK_SIZE", 1024)
+    manager = object.__new__(model_manager.ModelManager)
+    manager.model_cipher = AESGCM(AESGCM.generate_key(bit_length=256))
 
-    docker_files = [
-        "../docker/Dockerfile.privacy-focused",
-        "../docker/docker-compose.yml",
-        "../requirements.txt"
-    ]
+    source = tmp_path / "weights.bin"
+    source.write_bytes(os.urandom(4096))
+    encrypted = tmp_path / "weights.bin.enc"
+    manager._encrypt_file(source, encrypted, "weights.bin")
 
-    base_dir = os.path.dirname(__file__)
+    with pytest.raises(InvalidTag):
+        manager._decrypt_file(encrypted, tmp_path / "moved", "other.bin")
 
-    for file_path in docker_files:
-        full_path = os.path.join(base_dir, file_path)
-        assert os.path.exists(full_path), f"Missing required file: {file_path}"
+    raw = bytearray(encrypted.read_bytes())
+    raw[-1] ^= 1
+    encrypted.write_bytes(bytes(raw))
+    with pytest.raises(InvalidTag):
+        manager._decrypt_file(encrypted, tmp_path / "out", "weights.bin")
+    assert not (tmp_path / "out").exists()
 
-    print("✅ Docker configuration files exist")
+    encrypted.write_bytes(bytes(raw[:-10]))
+    with pytest.raises(ValueError):
+        manager._decrypt_file(encrypted, tmp_path / "out", "weights.bin")
 
 if __name__ == "__main__":
-    test_imports()
-    test_environment_variables()
-    test_docker_files_exist()
-    print("✅ All basic tests passed!")
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-q"]))